@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Compute PipelineRuns and TaskRuns statistics (counts, first/last
+# timestamps, duration, pending and running min/avg/max, stddev and
+# percentiles) from pipelineruns.json and taskruns.json dumped by
+# benchmark-tekton.sh. Every file is read once, item by item, only the
+# timestamps and Succeeded condition are kept and stats are computed with
+# numpy over these columns. Result is merged into benchmark-tekton.json in
+# one write.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+PERCENTILES = [50, 90, 95, 99]
+
+# Stat family => (from column, to column)
+DURATIONS = {
+    "duration": ("creationTimestamp", "completionTime"),
+    "pending": ("creationTimestamp", "startTime"),
+    "running": ("startTime", "completionTime"),
+}
+
+
+def iterate_items(path):
+    """
+    Yield items of Kubernetes List stored in JSON file. With ijson installed
+    the file is parsed incrementally so the whole list is never in memory.
+    """
+    with open(path, "rb") as fd:
+        if ijson is not None:
+            yield from ijson.items(fd, "items.item")
+        else:
+            yield from json.load(fd)["items"]
+
+
+class RunsColumns:
+    """
+    Columns of fields needed for the stats, one row per run.
+    """
+
+    def __init__(self):
+        self.creationTimestamp = []
+        self.startTime = []
+        self.completionTime = []
+        self.status = []  # status of Succeeded condition, "" if none
+        self.reason = []  # reason of Succeeded condition, "" if none
+
+    def add(self, item):
+        status = item.get("status", {})
+        condition = {}
+        for c in status.get("conditions") or []:
+            if c.get("type") == "Succeeded":
+                condition = c
+                break
+        self.creationTimestamp.append(item["metadata"].get("creationTimestamp") or "NaT")
+        self.startTime.append(status.get("startTime") or "NaT")
+        self.completionTime.append(status.get("completionTime") or "NaT")
+        self.status.append(condition.get("status", ""))
+        self.reason.append(condition.get("reason", ""))
+
+    def arrays(self):
+        """
+        Return dict of numpy arrays: timestamps as datetime64 (NaT when
+        missing) and condition status and reason as strings.
+        """
+        out = {}
+        for name in DURATIONS["duration"] + ("startTime",):
+            # Strip trailing "Z", numpy parses naive ISO timestamps only
+            out[name] = numpy.array([i.rstrip("Z") for i in getattr(self, name)], dtype="datetime64[s]")
+        out["status"] = numpy.array(self.status, dtype=str)
+        out["reason"] = numpy.array(self.reason, dtype=str)
+        return out
+
+
+def load_columns(path):
+    columns = RunsColumns()
+    size = os.path.getsize(path)
+    started = time.perf_counter()
+    for item in iterate_items(path):
+        columns.add(item)
+    duration = time.perf_counter() - started
+    logging.info(
+        f"Loaded {len(columns.status)} items from {path} in {duration:.2f} s ({size / 1024 / 1024 / max(duration, 1e-9):.1f} MB/s)"
+    )
+    return columns.arrays()
+
+
+def describe(values):
+    """
+    Return min, avg, max, stddev and percentiles of given numpy array, all
+    None when it is empty.
+    """
+    out = {"min": None, "avg": None, "max": None, "stddev": None}
+    out.update({f"p{p}": None for p in PERCENTILES})
+    if values.size == 0:
+        return out
+    out["min"] = values.min().item()
+    out["avg"] = values.mean().item()
+    out["max"] = values.max().item()
+    out["stddev"] = values.std().item()
+    for p, value in zip(PERCENTILES, numpy.percentile(values, PERCENTILES)):
+        out[f"p{p}"] = value.item()
+    return out
+
+
+def first_last(values):
+    """
+    Return first and last of given timestamps formatted like in Kubernetes
+    objects, missing timestamps are ignored.
+    """
+    values = values[~numpy.isnat(values)]
+    if values.size == 0:
+        return {"first": None, "last": None}
+    return {
+        "first": str(values.min()) + "Z",
+        "last": str(values.max()) + "Z",
+    }
+
+
+def compute_stats(columns, timestamps):
+    """
+    Duration families are computed only from successful runs. With
+    timestamps also add counts and first/last timestamps.
+    """
+    stats = {}
+    successful = columns["status"] == "True"
+    for family, (start, end) in DURATIONS.items():
+        values = (columns[end][successful] - columns[start][successful]).astype("int64")
+        valid = ~(numpy.isnat(columns[end][successful]) | numpy.isnat(columns[start][successful]))
+        stats[family] = describe(values[valid])
+    if timestamps:
+        stats["count"] = {
+            "succeeded": str(int(numpy.count_nonzero(successful & (columns["reason"] == "Succeeded")))),
+            "failed": str(int(numpy.count_nonzero((columns["status"] != "") & (columns["status"] != "True") & (columns["reason"] != "Running")))),
+        }
+        for name in ("creationTimestamp", "startTime", "completionTime"):
+            stats[name] = first_last(columns[name])
+    return stats
+
+
+def merge(target, source):
+    """
+    Recursively merge source dict into target dict.
+    """
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute PipelineRuns and TaskRuns stats and merge them into status data file",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--pipelineruns", help="JSON list of PipelineRuns", default="pipelineruns.json")
+    parser.add_argument("--taskruns", help="JSON list of TaskRuns, skipped if it does not exist", default="taskruns.json")
+    parser.add_argument("--polling-report", help="Polling report from benchmark-tekton.py with final counts, skipped if it does not exist", default="benchmark-tekton-polling.json")
+    parser.add_argument("--output", help="Status data file to merge results into", default="benchmark-tekton.json")
+    parser.add_argument("-d", "--debug", action="store_true", help="Show debug output")
+    args = parser.parse_args()
+
+    fmt = "%(asctime)s %(name)s %(levelname)s %(message)s"
+    logging.basicConfig(format=fmt, level=logging.DEBUG if args.debug else logging.INFO)
+
+    results = {"PipelineRuns": compute_stats(load_columns(args.pipelineruns), timestamps=True)}
+
+    if os.path.exists(args.polling_report):
+        with open(args.polling_report, "r") as fd:
+            polling = json.load(fd)
+        results["polling"] = polling
+        for key in ("remaining", "pending", "running"):
+            results["PipelineRuns"]["count"][key] = str(polling["last"][key])
+
+    if os.path.exists(args.taskruns):
+        results["TaskRuns"] = compute_stats(load_columns(args.taskruns), timestamps=False)
+
+    with open(args.output, "r") as fd:
+        data = json.load(fd)
+    merge(data.setdefault("results", {}), results)
+    with open(args.output + ".tmp", "w") as fd:
+        json.dump(data, fd, indent=4)
+    os.replace(args.output + ".tmp", args.output)
+    logging.info(f"Stats merged into {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
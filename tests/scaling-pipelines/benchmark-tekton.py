@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Keep given number of PipelineRuns running until given total number of them
+# finished. Polls PipelineRuns in Table format (only the printer columns, not
+# whole objects) and counts pending/running/finished in one pass. At the end
+# dumps full PipelineRuns once and reports how many bytes and CPU per poll
+# it took compared to fetching full JSON.
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import sys
+import time
+import urllib.request
+
+import kubernetes
+import yaml
+
+TABLE_ACCEPT = "application/json;as=Table;v=v1;g=meta.k8s.io"
+PAGE_SIZE = 500
+
+
+def load_run(path):
+    """
+    Load PipelineRun to create from local file or URL.
+    """
+    if path.startswith("http://") or path.startswith("https://"):
+        with urllib.request.urlopen(path) as response:
+            return yaml.safe_load(response.read())
+    with open(path, "r") as fd:
+        return yaml.safe_load(fd)
+
+
+def current_namespace():
+    _, context = kubernetes.config.list_kube_config_contexts()
+    return context["context"].get("namespace", "default")
+
+
+def succeeded_statuses(response):
+    """
+    Yield status of Succeeded condition (None if there is no condition yet)
+    of every PipelineRun in Table or ordinary list response.
+    """
+    if response.get("kind") == "Table":
+        columns = [c["name"] for c in response["columnDefinitions"]]
+        idx = columns.index("Succeeded")
+        for row in response["rows"]:
+            yield row["cells"][idx] or None
+    else:
+        for item in response["items"]:
+            conditions = item.get("status", {}).get("conditions")
+            yield conditions[0]["status"] if conditions else None
+
+
+def count_states(statuses):
+    """
+    Count all, pending, running and finished PipelineRuns in one pass.
+    """
+    counts = {"all": 0, "pending": 0, "running": 0, "finished": 0}
+    for status in statuses:
+        counts["all"] += 1
+        if status is None:
+            counts["pending"] += 1
+        elif status == "Unknown":
+            counts["running"] += 1
+        else:
+            counts["finished"] += 1
+    return counts
+
+
+class PipelineRunsPoller:
+    """
+    Fetch PipelineRuns page by page, either as Table (only printer columns)
+    or as full objects, noting how many bytes and CPU each fetch took.
+    """
+
+    def __init__(self, namespace, table, pool_size=5):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.namespace = namespace
+        self.table = table
+        self.polls = []  # (bytes, cpu seconds, wall seconds) of each poll
+
+        kubernetes.config.load_kube_config()
+        configuration = kubernetes.client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = pool_size
+        self._api = kubernetes.client.CustomObjectsApi(kubernetes.client.ApiClient(configuration))
+        # Default headers override what the generated client sets
+        table_client = kubernetes.client.ApiClient(configuration)
+        table_client.set_default_header("Accept", TABLE_ACCEPT)
+        self._table_api = kubernetes.client.CustomObjectsApi(table_client)
+
+    def fetch(self, table):
+        """
+        Return list of decoded pages and number of bytes transferred.
+        """
+        api = self._table_api if table else self._api
+        pages = []
+        size = 0
+        kwargs = {"limit": PAGE_SIZE}
+        while True:
+            response = api.list_namespaced_custom_object(
+                "tekton.dev",
+                "v1",
+                self.namespace,
+                "pipelineruns",
+                _preload_content=False,
+                **kwargs,
+            )
+            data = response.data
+            size += len(data)
+            page = json.loads(data)
+            pages.append(page)
+            kwargs["_continue"] = page["metadata"].get("continue")
+            if not kwargs["_continue"]:
+                return pages, size
+
+    def poll(self):
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        pages, size = self.fetch(self.table)
+        counts = count_states(
+            status for page in pages for status in succeeded_statuses(page)
+        )
+        self.polls.append(
+            (size, time.process_time() - cpu_start, time.monotonic() - wall_start)
+        )
+        if self.table and len(pages) > 0 and pages[0].get("kind") != "Table":
+            self.logger.warning("Server does not support Table format, falling back to full objects")
+            self.table = False
+        return counts
+
+    def dump(self, path):
+        """
+        Fetch full PipelineRuns once, write them to path in the same shape
+        as 'kubectl get pr -o json' and return cost of that fetch.
+        """
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        pages, size = self.fetch(False)
+        items = [item for page in pages for item in page["items"]]
+        cost = (size, time.process_time() - cpu_start, time.monotonic() - wall_start)
+        with open(path, "w") as fd:
+            json.dump({"apiVersion": "v1", "kind": "List", "items": items, "metadata": {}}, fd)
+        return cost, len(items)
+
+
+def polling_report(polls, full, last_counts):
+    """
+    Compare average poll with one full JSON fetch done at the end.
+    """
+    count = max(1, len(polls))
+    avg_bytes = sum(p[0] for p in polls) / count
+    avg_cpu = sum(p[1] for p in polls) / count
+    avg_wall = sum(p[2] for p in polls) / count
+    last_bytes = polls[-1][0] if len(polls) > 0 else 0
+    return {
+        "polls": len(polls),
+        "bytes_total": sum(p[0] for p in polls),
+        "bytes_avg": avg_bytes,
+        "cpu_avg": avg_cpu,
+        "wall_avg": avg_wall,
+        # Last poll and the full fetch saw the same PipelineRuns
+        "last_poll_bytes": last_bytes,
+        "full_fetch_bytes": full[0],
+        "full_fetch_cpu": full[1],
+        "full_fetch_wall": full[2],
+        "bytes_saved_ratio": 1 - last_bytes / full[0] if full[0] > 0 else None,
+        "last": last_counts,
+    }
+
+
+def create_runs(api, run, namespace, count, executor):
+    group, version = run["apiVersion"].split("/")
+    plural = run["kind"].lower() + "s"
+    futures = [
+        executor.submit(
+            api.create_namespaced_custom_object, group, version, namespace, plural, run
+        )
+        for _ in range(count)
+    ]
+    for future in concurrent.futures.as_completed(futures):
+        try:
+            future.result()
+        except Exception as e:
+            logging.warning(f"Failed to create run: {e}")
+
+
+def doit(args):
+    namespace = args.namespace if args.namespace is not None else current_namespace()
+    run = load_run(args.run)
+    poller = PipelineRunsPoller(namespace, table=not args.full, pool_size=args.creation_workers)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.creation_workers)
+
+    started = time.monotonic()
+    counts = None
+    while True:
+        counts = poller.poll()
+        counts["remaining"] = args.total - counts["all"]
+        logging.debug(
+            f"out of {args.total} runs {counts['all']} already exists, {counts['pending']} pending, {counts['finished']} finished and {counts['running']} running (poll took {poller.polls[-1][0]} bytes, {poller.polls[-1][1]:.3f} s CPU)"
+        )
+
+        if counts["finished"] >= args.total:
+            break
+
+        needed = min(args.concurrent - counts["running"] - counts["pending"], counts["remaining"])
+
+        elapsed = time.monotonic() - started
+        if args.timeout > 0 and elapsed > args.timeout:
+            logging.info(f"after {elapsed:.0f}s exceeded {args.timeout}s timeout, bye")
+            break
+
+        if needed > 0:
+            logging.debug(f"creating {needed} runs to raise concurrency to {args.concurrent}")
+            create_runs(poller._api, run, namespace, needed, executor)
+
+        time.sleep(args.delay)
+    executor.shutdown()
+
+    full, items = poller.dump(args.data_file)
+    report = polling_report(poller.polls, full, counts)
+    logging.info(
+        f"Polled {report['polls']} times, {report['bytes_avg']:.0f} bytes and {report['cpu_avg']:.3f} s CPU per poll on average. Full JSON of {items} PipelineRuns had {full[0]} bytes and took {full[1]:.3f} s CPU (last poll {report['last_poll_bytes']} bytes)."
+    )
+    with open(args.report_file, "w") as fd:
+        json.dump(report, fd, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep given concurrency of PipelineRuns until total number of them finishes",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--total", help="How many PipelineRuns have to finish", default=10000, type=int)
+    parser.add_argument("--concurrent", help="How many PipelineRuns to keep pending or running", default=100, type=int)
+    parser.add_argument("--run", help="PipelineRun file or URL to create", default="./run.yaml")
+    parser.add_argument("--timeout", help="How many seconds to let the test run overall, 0 for no limit", default=0, type=int)
+    parser.add_argument("--namespace", help="Namespace to work in, current context namespace by default", default=None)
+    parser.add_argument("--delay", help="Seconds between polls", default=1.0, type=float)
+    parser.add_argument("--creation-workers", help="How many PipelineRuns to create in parallel", default=20, type=int)
+    parser.add_argument("--full", help="Poll full objects instead of Table format (to compare)", action="store_true")
+    parser.add_argument("--data-file", help="Where to dump PipelineRuns at the end", default="pipelineruns.json")
+    parser.add_argument("--report-file", help="Where to write polling report with final counts", default="benchmark-tekton-polling.json")
+    parser.add_argument("-d", "--debug", action="store_true", help="Show debug output")
+    args = parser.parse_args()
+
+    fmt = "%(asctime)s %(name)s %(levelname)s %(message)s"
+    logging.basicConfig(format=fmt, level=logging.DEBUG if args.debug else logging.INFO)
+    logging.getLogger("urllib3").setLevel(logging.INFO)
+    logging.getLogger("kubernetes").setLevel(logging.INFO)
+
+    return doit(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,22 +3,37 @@
 
 import argparse
 import collections
+import concurrent.futures
 import csv
 import datetime
+import gzip
+import heapq
+import itertools
+import http.server
 import json
 import kubernetes
 import kubernetes.client.exceptions
 import logging
 import logging.handlers
+import math
+import multiprocessing
 import os
 import queue
 import pkg_resources
+import random
 import requests
 import sys
 import time
 import threading
+import traceback
 import urllib3
 import yaml
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Constants Flags and Parameters
 TOTAL_RUN__FOR__WAIT_FOR_DURAITON_FLAG = 1_000_000
@@ -33,6 +48,81 @@ TEKTON_ANNOTATIONS_TO_CAPTURE = [
     ("results.tekton.dev/stored", "result_stored"),
 ]
 
+# Counters we report per namespace for both PipelineRuns and TaskRuns
+RUN_COUNTERS = [
+    "total",
+    "failed",
+    "pending",
+    "running",
+    "finished",
+    "signed_true",
+    "signed_false",
+    "finalizers_present",
+    "finalizers_absent",
+    "deleted",
+    "terminated",
+    "log_present",
+    "result_present",
+    "record_present",
+    "result_stored_true",
+    "result_stored_false",
+]
+
+# Lifecycle latencies we track for both PipelineRuns and TaskRuns:
+# name => (timestamps to use as start in order of preference, end timestamp)
+LATENCIES = {
+    "create_start": (("creationTimestamp",), "startTime"),
+    "start_complete": (("startTime",), "completionTime"),
+    "complete_signed": (("completionTime", "finished_at"), "signed_at"),
+    "complete_stored": (("completionTime", "finished_at"), "result_stored_at"),
+    "complete_deleted": (("completionTime", "finished_at"), "deleted_at"),
+}
+LATENCY_PERCENTILES = (50, 99)
+LATENCY_COUNTERS = [
+    f"{name}_p{p}" for name in LATENCIES for p in LATENCY_PERCENTILES
+]
+
+# Health of PipelineRuns and TaskRuns watches (see WatchMetrics)
+WATCH_COUNTERS = [
+    "watch_queue_depth",
+    "watch_events_per_second",
+    "watch_restarts",
+    "watch_resets",
+] + [f"watch_{name}_p{p}" for name in ("lag", "queue_lag") for p in LATENCY_PERCENTILES]
+
+# Columns of the stats file, one row per namespace per reconciliation loop
+STATS_COLUMNS = (
+    [
+        "namespace",
+        "monitoring_start",
+        "monitoring_now",
+        "monitoring_second",
+    ]
+    + ["prs_" + c for c in RUN_COUNTERS[:9]]
+    + ["prs_started_worked", "prs_started_failed"]
+    + ["prs_" + c for c in RUN_COUNTERS[9:]]
+    + ["trs_" + c for c in RUN_COUNTERS]
+    + ["prs_" + c for c in LATENCY_COUNTERS]
+    + ["trs_" + c for c in LATENCY_COUNTERS]
+    + ["prs_" + c for c in WATCH_COUNTERS]
+    + ["trs_" + c for c in WATCH_COUNTERS]
+)
+
+
+def stats_column_type(name):
+    """
+    Return type of values in given stats column: "string", "float" or
+    "int". Used to give typed formats (parquet) fixed schema, as
+    percentiles stay None until first runs complete.
+    """
+    if name in ("namespace", "monitoring_start", "monitoring_now"):
+        return "string"
+    if name == "monitoring_second" or name.endswith(
+        ("_per_second",) + tuple(f"_p{p}" for p in LATENCY_PERCENTILES)
+    ):
+        return "float"
+    return "int"
+
 
 def setup_logger(stderr_log_lvl, log_file):
     """
@@ -85,6 +175,138 @@ def find(path, data):
     return rv
 
 
+def json_loads(data):
+    """
+    Decode JSON, using much faster orjson if it is available.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def str2ts(value):
+    """
+    Convert Kubernetes timestamp string (e.g. "2024-01-01T12:00:00Z") to epoch float.
+    """
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def ts2str(value):
+    """
+    Convert epoch float back to Kubernetes timestamp string.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(value))
+
+
+def ts2iso(value):
+    """
+    Convert epoch float to the ISO format we use for our own timestamps.
+    """
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).isoformat()
+
+
+class RunRecord:
+    """
+    Compact record of tracked PipelineRun or TaskRun.
+
+    Attribute that was never set is simply missing from the output the same
+    way missing key was missing in the dict we used before. Timestamps are
+    kept as epoch floats, states, outcomes and "true"/"false" annotation
+    values are interned strings shared by all the records.
+    """
+
+    # Timestamps we get from the cluster, serialized as Kubernetes timestamps
+    CLUSTER_TIMESTAMPS = (
+        "creationTimestamp",
+        "deletionTimestamp",
+        "startTime",
+        "completionTime",
+    )
+    # Timestamps when we have noticed something, serialized in ISO format
+    LOCAL_TIMESTAMPS = (
+        "requested_at",
+        "created_at",
+        "finished_at",
+        "finalizers_at",
+        "signed_at",
+        "log_at",
+        "record_at",
+        "result_at",
+        "result_stored_at",
+        "deleted_at",
+    )
+    __slots__ = (
+        ("namespace", "state", "outcome", "finalizers", "deleted", "terminated")
+        + tuple(key for _, key in TEKTON_ANNOTATIONS_TO_CAPTURE)
+        + CLUSTER_TIMESTAMPS
+        + LOCAL_TIMESTAMPS
+    )
+
+    def __init__(self, namespace):
+        self.namespace = sys.intern(namespace)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def to_dict(self):
+        out = {}
+        for name in self.__slots__:
+            try:
+                value = getattr(self, name)
+            except AttributeError:
+                continue
+            if name in self.CLUSTER_TIMESTAMPS:
+                value = ts2str(value)
+            elif name in self.LOCAL_TIMESTAMPS:
+                value = ts2iso(value)
+            out[name] = value
+        return out
+
+    def to_state(self):
+        """
+        Return raw values of all set attributes, for checkpoints.
+        """
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if hasattr(self, name)
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        record = cls(state["namespace"])
+        for name, value in state.items():
+            if name != "namespace":
+                setattr(record, name, value)
+        return record
+
+    def sizeof(self):
+        """
+        Approximate memory used by this record, not counting shared values.
+        """
+        size = sys.getsizeof(self)
+        for name in self.CLUSTER_TIMESTAMPS + self.LOCAL_TIMESTAMPS + (
+            "log",
+            "record",
+            "result",
+        ):
+            try:
+                size += sys.getsizeof(getattr(self, name))
+            except AttributeError:
+                pass
+        return size
+
+
+def records_memory(data):
+    """
+    Return approximate memory used by given store of records in bytes.
+    """
+    size = sys.getsizeof(data)
+    for key, record in data.items():
+        size += sys.getsizeof(key) + record.sizeof()
+    return size
+
+
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, datetime.datetime):
@@ -93,62 +315,145 @@ class DateTimeEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+def project_event(event):
+    """
+    Keep only parts of the watch event process_events_thread needs, so we do
+    not keep whole objects (with potentially huge status) around.
+    """
+    obj = event["object"]
+    metadata = obj.get("metadata", {})
+    projected = {
+        "metadata": {
+            key: metadata[key]
+            for key in (
+                "name",
+                "namespace",
+                "resourceVersion",
+                "creationTimestamp",
+                "deletionTimestamp",
+                "finalizers",
+            )
+            if key in metadata
+        }
+    }
+    if "annotations" in metadata:
+        projected["metadata"]["annotations"] = {
+            annotation: metadata["annotations"][annotation]
+            for annotation, _ in TEKTON_ANNOTATIONS_TO_CAPTURE
+            if annotation in metadata["annotations"]
+        }
+    if "status" in obj:
+        status = obj["status"]
+        projected["status"] = {
+            key: status[key] for key in ("startTime", "completionTime") if key in status
+        }
+        if "conditions" in status:
+            projected["status"]["conditions"] = status["conditions"][:1]
+    return {"type": event["type"], "object": projected}
+
+
 class EventsWatcher:
 
-    def __init__(self, args, stop_event):
+    def __init__(self, args, stop_event, namespaces=None):
         """
         Watch indefinetely.
+
+        By default we watch whole cluster. With --watch-namespaced we run
+        one watch per benchmark namespace (or per given namespace), all
+        feeding one buffer. With --run-label only runs with that label are
+        listed and watched.
+
+        We read raw responses (_preload_content=False) and decode them
+        ourselves, keeping only fields we need (see project_event), instead
+        of letting kubernetes client deserialize whole objects.
+
+        Every event gets "received_at" epoch time when it was read from the
+        stream, so it does not matter how long it waited in the buffer.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.args = args
         self.stop_event = stop_event
+        self.namespaces = namespaces
         self.counter = 0  # how many event we have returned
         self._buffer = queue.Queue()
+        self.metrics = WatchMetrics(self._buffer)
+        # Per stream (namespace) resource version we can resume watching from
+        # because all events up to it were already processed
+        self.resource_versions = {}
+        self._returned = {}  # stream => resource version from last returned batch
+        self._pending_exception = None  # exception to raise once current batch is processed
 
         kubernetes.config.load_kube_config()
         self._api_instance = None
         self._func = None
         self._kwargs = None
-        self._watch = kubernetes.watch.Watch()
 
     def stop(self):
         self.logger.info("We were asked to stop")
         self.stop_event.set()
-        self._watch.stop()
 
-    def _safe_stream(self):
+    def _streams_kwargs(self):
+        """
+        Return list of kwargs for list/watch calls, one per stream we run.
+        """
+        if self.namespaces is not None:
+            namespaces = self.namespaces
+        elif self.args.watch_namespaced:
+            namespaces = benchmark_namespaces(self.args)
+        else:
+            namespaces = [""]  # all namespaces
+        streams = []
+        for namespace in namespaces:
+            kwargs = dict(self._kwargs, namespace=namespace)
+            if namespace in self.resource_versions:
+                kwargs["resource_version"] = self.resource_versions[namespace]
+            if self.args.run_label is not None:
+                kwargs["label_selector"] = self.args.run_label
+            streams.append(kwargs)
+        return streams
+
+    def _watch_stream(self, kwargs):
+        """
+        Yield projected watch events, decoding response line by line.
+        """
+        response = self._func(watch=True, _preload_content=False, **kwargs)
+        try:
+            for line in kubernetes.watch.watch.iter_resp_lines(response):
+                event = json_loads(line)
+                if event["type"] == "ERROR":
+                    status = event["object"]
+                    raise kubernetes.client.exceptions.ApiException(
+                        status=status.get("code"), reason=status.get("message")
+                    )
+                yield project_event(event)
+                if self.stop_event.is_set():
+                    return
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _safe_stream(self, kwargs):
         """
         Iterate through events, skipping these without resource version.
+        Yields resource version we can resume from once the event is
+        processed (or None) together with the event.
         If watch just ends (no more events), retry it.
         Catch unimportant issues and retries as needed.
         """
         while True:
             try:
 
-                # First list all
-                self.logger.info("Starting list all stream")
-                _newest = None
-                for event in self._func(**self._kwargs)["items"]:
-                    try:
-                        _completion_time = event["status"]["completionTime"]
-                        _resource_version = event["metadata"]["resourceVersion"]
-                    except KeyError:
-                        continue
-                    else:
-                        if (
-                            _newest is None or _newest <= _completion_time
-                        ):  # comparing strings, yay!
-                            _newest = _completion_time
-                            self._kwargs["resource_version"] = _resource_version
-
-                    yield {"type": "MY_INITIAL_SYNC", "object": event}
+                # First list all (unless we know where to continue watching from),
+                # page by page, and start watching from version of that list
+                if kwargs.get("resource_version") is None:
+                    yield from self._paginated_list(kwargs)
 
                 # Now start watching
-                self.logger.info("Starting watch stream")
-                for event in self._watch.stream(self._func, **self._kwargs):
+                self.logger.info(f"Starting watch stream in '{kwargs['namespace']}'")
+                for event in self._watch_stream(kwargs):
                     # Remember resource_version if it is there, if it is missing, ignore event.
                     try:
-                        self._kwargs["resource_version"] = event["object"]["metadata"][
+                        kwargs["resource_version"] = event["object"]["metadata"][
                             "resourceVersion"
                         ]
                     except KeyError:
@@ -157,7 +462,7 @@ class EventsWatcher:
                         )
                         continue
 
-                    yield event
+                    yield kwargs["resource_version"], event
 
                 self.logger.info("Watch stream finished")
 
@@ -166,8 +471,9 @@ class EventsWatcher:
                     return
                 else:
                     self.logger.warning(
-                        f"Watch ended (last resource version {self._kwargs['resource_version']}), retrying"
+                        f"Watch ended (last resource version {kwargs['resource_version']}), retrying"
                     )
+                    self.metrics.watch_restarted()
 
             except kubernetes.client.exceptions.ApiException as e:
 
@@ -176,7 +482,8 @@ class EventsWatcher:
                     self.logger.warning(
                         f"Watch failed with: {e_text}, resetting resource_version"
                     )
-                    self._kwargs["resource_version"] = None
+                    kwargs["resource_version"] = None
+                    self.metrics.watch_restarted(reset=True)
                 else:
                     raise
 
@@ -186,45 +493,171 @@ class EventsWatcher:
             ) as e:
 
                 logging.warning(f"Watch failed with: {e}, retrying")
+                self.metrics.watch_restarted()
 
-    def _buffered_iterator(self):
-        my_iterator = self._safe_stream()
+    def _paginated_list(self, kwargs):
+        """
+        List all objects page by page following continue tokens, yielding
+        them as pages arrive. Sets resource version of the list to kwargs
+        so watch continues exactly from the listed state. Last listed item
+        is yielded with that resource version, so we can resume watching
+        from there once it is processed.
+        """
+        self.logger.info(f"Starting list all stream in '{kwargs['namespace']}'")
+        started = time.monotonic()
+        count = 0
+        pages = 0
+        list_kwargs = dict(kwargs)
+        list_kwargs.pop("resource_version", None)
+        while True:
+            response = json_loads(
+                self._func(_preload_content=False, **list_kwargs).data
+            )
+            pages += 1
+            list_kwargs["_continue"] = response["metadata"].get("continue")
+            last_page = not list_kwargs["_continue"]
+            for idx, item in enumerate(response["items"]):
+                count += 1
+                if last_page and idx == len(response["items"]) - 1:
+                    resource_version = response["metadata"]["resourceVersion"]
+                else:
+                    resource_version = None
+                yield resource_version, project_event(
+                    {"type": "MY_INITIAL_SYNC", "object": item}
+                )
+            if last_page:
+                break
+        kwargs["resource_version"] = response["metadata"]["resourceVersion"]
+        self.logger.info(
+            f"Initial list in '{kwargs['namespace']}' synced {count} objects in {pages} pages in {time.monotonic() - started:.2f} seconds, watching from resource version {kwargs['resource_version']}"
+        )
+
+    def _buffered_iterator(self, kwargs):
+        my_iterator = self._safe_stream(kwargs)
         try:
             while True:
-                self._buffer.put(next(my_iterator))
+                resource_version, event = next(my_iterator)
+                event["received_at"] = time.time()
+                self._buffer.put((kwargs["namespace"], resource_version, event))
                 if self.stop_event.is_set():
                     raise StopIteration("Quitting detached iterator on request")
         except BaseException as e:
             self._buffer.put(e)
 
     def __iter__(self):
+        self.start()
+        return self
+
+    def start(self):
         # Having actual iterator in standalone thread, putting data to the queue
         # and then locally just reading from the queue allows us to kill
         # the iterator when needed. Idea comes from this timeout_iterator code:
         # https://github.com/leangaurav/pypi_iterator/blob/main/iterators/timeout_iterator.py
-        self.iterator_thread = threading.Thread(
-            target=self._buffered_iterator, daemon=True
-        )
-        self.iterator_thread.start()
-        return self
+        self.iterator_threads = []
+        for kwargs in self._streams_kwargs():
+            iterator_thread = threading.Thread(
+                target=self._buffered_iterator, args=[kwargs], daemon=True
+            )
+            iterator_thread.start()
+            self.iterator_threads.append(iterator_thread)
 
     def __next__(self):
+        batch = self.next_batch(1)
+        return batch[0] if len(batch) > 0 else None
+
+    def next_batch(self, max_events):
+        """
+        Return list of up to max_events buffered events (empty if none
+        arrived within 0.1 seconds), with events for the same object
+        coalesced (see coalesce_events).
+
+        Caller processes whole batch before asking for next one, so when
+        it does, resource versions from previous batch were processed.
+        """
+        for stream, resource_version in self._returned.items():
+            self.resource_versions[stream] = resource_version
+        self._returned = {}
+
+        if self._pending_exception is not None:
+            self.stop()
+            raise self._pending_exception
+
         if self.stop_event.is_set():
             raise StopIteration("Quitting on request")
 
         try:
-            event = self._buffer.get(timeout=0.1)
+            items = [self._buffer.get(timeout=0.1)]
         except queue.Empty:
-            event = None
-        else:
-            self.counter += 1
-
-        # Propagate any exceptions including StopIteration
-        if isinstance(event, BaseException):
-            self.stop()
-            raise event
-
-        return event
+            return []
+        while len(items) < max_events:
+            try:
+                items.append(self._buffer.get_nowait())
+            except queue.Empty:
+                break
+
+        events = []
+        for item in items:
+            # Propagate any exceptions including StopIteration, but only
+            # once events received before it are processed
+            if isinstance(item, BaseException):
+                self._pending_exception = item
+                break
+            stream, resource_version, event = item
+            if resource_version is not None:
+                self._returned[stream] = resource_version
+            events.append(event)
+
+        self.counter += len(events)
+        return coalesce_events(events)
+
+
+def event_milestones(event):
+    """
+    Return names of first-seen timestamps of the run (see
+    process_events_thread) the event would set if it was the first event
+    with that information.
+    """
+    obj = event["object"]
+    milestones = []
+    conditions = obj.get("status", {}).get("conditions")
+    if conditions and conditions[0]["status"] != "Unknown":
+        milestones.append("finished_at")
+    if "finalizers" in obj["metadata"]:
+        milestones.append("finalizers_at")
+    annotations = obj["metadata"].get("annotations", {})
+    for annotation, key in TEKTON_ANNOTATIONS_TO_CAPTURE:
+        if annotation in annotations:
+            milestones.append(key + "_at")
+    if event["type"] == "DELETED":
+        milestones.append("deleted_at")
+    return milestones
+
+
+def coalesce_events(events):
+    """
+    Keep only the latest event for every object. When some events are
+    dropped, latest one gets "first_seen" dict with time (when received)
+    of the earliest dropped event carrying given milestone (see
+    event_milestones), so first-seen timestamps are the same as if all
+    events were processed one by one. It also gets "annotations_missing"
+    when some dropped event had no annotations at all.
+    """
+    if len(events) < 2:
+        return events
+    coalesced = {}
+    for event in events:
+        metadata = event["object"]["metadata"]
+        key = (metadata.get("namespace"), metadata.get("name"))
+        previous = coalesced.pop(key, None)
+        if previous is not None:
+            first_seen = previous.get("first_seen", {})
+            for name in event_milestones(previous):
+                first_seen.setdefault(name, previous["received_at"])
+            event["first_seen"] = first_seen
+            if previous.get("annotations_missing") or "annotations" not in previous["object"]["metadata"]:
+                event["annotations_missing"] = True
+        coalesced[key] = event
+    return list(coalesced.values())
 
 
 class PRsEventsWatcher(EventsWatcher):
@@ -263,114 +696,756 @@ class TRsEventsWatcher(EventsWatcher):
         }
 
 
-def process_events_thread(watcher, data, lock):
-    for event in watcher:
-        if event is None:
-            continue
+WATCHERS = {"pipelineruns": PRsEventsWatcher, "taskruns": TRsEventsWatcher}
+
+
+WATCH_WORKER_HEARTBEAT = 1.0  # seconds between state updates of idle watch worker
+
+
+def watch_worker(kind, idx, args, namespaces, resource_versions, events_queue, in_transit, stop_event, log_queue):
+    """
+    Body of watch worker process (see ShardedEventsWatcher): watch given
+    namespaces (None for whole cluster), decode, project and coalesce
+    events and ship batches of them to the coordinator. Log records are
+    forwarded to the coordinator, so they end up in its handlers.
+    """
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.NOTSET)  # coordinator handlers filter by level
+    watcher = WATCHERS[kind](args=args, stop_event=stop_event, namespaces=namespaces)
+    watcher.resource_versions.update(resource_versions)
+    watcher.start()
+    last_state = None
+    last_sent = 0
+    try:
+        while True:
+            batch = watcher.next_batch(args.batch_size)
+            restarts = (watcher.metrics.restarts, watcher.metrics.resets)
+            # Idle worker only sends its state when restarts changed or as
+            # a heartbeat, so coordinator is not busy with empty messages
+            if (
+                len(batch) == 0
+                and len(watcher._returned) == 0
+                and restarts == last_state
+                and time.monotonic() - last_sent < WATCH_WORKER_HEARTBEAT
+            ):
+                continue
+            with in_transit.get_lock():
+                in_transit.value += len(batch)
+            # Resource versions coordinator can resume from once it processes this batch
+            events_queue.put(
+                (
+                    idx,
+                    "events",
+                    dict(watcher._returned),
+                    batch,
+                    restarts + (watcher._buffer.qsize(),),
+                )
+            )
+            last_state = restarts
+            last_sent = time.monotonic()
+    except StopIteration:
+        events_queue.put((idx, "stopped", None, None, None))
+    except BaseException:
+        events_queue.put((idx, "error", traceback.format_exc(), None, None))
+
+
+def watch_shards(args, processes):
+    """
+    Split watched namespaces into given number of shards by namespace name
+    hash. Shard is list of namespaces or None for whole cluster.
+    """
+    if processes == 1 and not args.watch_namespaced:
+        return [None]
+    shards = [[] for _ in range(processes)]
+    for namespace in benchmark_namespaces(args):
+        shards[zlib.crc32(namespace.encode()) % processes].append(namespace)
+    return [shard for shard in shards if len(shard) > 0]
 
-        logging.debug(f"Processing event: {json.dumps(event)[:100]}...")
+
+class ShardedEventsWatcher:
+    """
+    Drop-in replacement of EventsWatcher (start, next_batch, stop, metrics,
+    resource_versions) that runs the watches in worker processes (see
+    watch_worker), one per shard of namespaces, so decoding of events does
+    not compete for GIL with processing. Workers ship compact (projected
+    and coalesced) events, so processing and so stats stay the same as
+    with in-process watching.
+    """
+
+    def __init__(self, kind, args, stop_event, shards):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.kind = kind
+        self.args = args
+        self.stop_event = stop_event
+        self.shards = shards
+        self.counter = 0
+        self.resource_versions = {}
+        self._returned = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._worker_stop_event = self._context.Event()
+        self._queue = self._context.Queue()
+        self._in_transit = self._context.Value("q", 0)  # events shipped but not received yet
+        # Log records from workers, handled by handlers of our root logger
+        self._log_queue = self._context.Queue()
+        self._log_listener = None
+        self._workers = []
+        self._worker_state = {}  # worker => (restarts, resets, buffered events)
+        self._stopped_workers = set()
+        self.metrics = WatchMetrics(self)
+
+    def qsize(self):
+        """
+        Events received by workers but not processed yet (used by metrics).
+        """
+        return self._in_transit.value + sum(s[2] for s in self._worker_state.values())
+
+    def stop(self):
+        self.logger.info("We were asked to stop")
+        self.stop_event.set()
+
+    def start(self):
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, *logging.getLogger().handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+        for idx, shard in enumerate(self.shards):
+            streams = shard if shard is not None else [""]
+            worker = self._context.Process(
+                target=watch_worker,
+                args=[
+                    self.kind,
+                    idx,
+                    self.args,
+                    shard,
+                    {s: self.resource_versions[s] for s in streams if s in self.resource_versions},
+                    self._queue,
+                    self._in_transit,
+                    self._worker_stop_event,
+                    self._log_queue,
+                ],
+                name=f"{self.kind}_watcher_{idx}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+        self.logger.info(f"Started {len(self._workers)} {self.kind} watch processes")
+
+    def _stop_workers(self):
+        self._worker_stop_event.set()
+        deadline = time.monotonic() + 10
+        for worker in self._workers:
+            # Keep draining the queue, worker can not exit with unsent data
+            while worker.is_alive() and time.monotonic() < deadline:
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if worker.is_alive():
+                worker.terminate()
+        if self._log_listener is not None:
+            self._log_listener.stop()  # handles records workers sent before exiting
+            self._log_listener = None
+
+    def next_batch(self, max_events):
+        """
+        Return next batch of events shipped by one of the workers, batch
+        size is decided by workers (--batch-size), max_events is ignored.
+        """
+        for stream, resource_version in self._returned.items():
+            self.resource_versions[stream] = resource_version
+        self._returned = {}
+
+        if self.stop_event.is_set():
+            self._stop_workers()
+            raise StopIteration("Quitting on request")
 
         try:
-            # Generate unique name to avoid duplicates due to same object names in multiple-namespaces
-            e_namespace = find("object.metadata.namespace", event)
-            e_name = e_namespace + "." + find("object.metadata.name", event)
-        except KeyError as e:
-            logging.warning(f"Missing name in {json.dumps(event)}: {e} => skipping it")
-            continue
+            idx, message, data, batch, state = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        if message == "error":
+            self.stop()
+            self._stop_workers()
+            raise RuntimeError(f"Watch process failed: {data}")
+        if message == "stopped":
+            self._stopped_workers.add(idx)
+            if len(self._stopped_workers) == len(self._workers):
+                raise StopIteration("All watch processes finished")
+            return []
+
+        with self._in_transit.get_lock():
+            self._in_transit.value -= len(batch)
+        self._returned = data
+        self._worker_state[idx] = state
+        self.metrics.set_restarts(
+            sum(s[0] for s in self._worker_state.values()),
+            sum(s[1] for s in self._worker_state.values()),
+        )
+        self.counter += len(batch)
+        return batch
 
-        with lock:
-            # Collect metadata and timestamps if we do not have it already
-            for path in [
-                "object.metadata.namespace",
-                "object.metadata.creationTimestamp",
-                "object.metadata.deletionTimestamp",
-                "object.status.startTime",
-                "object.status.completionTime",
-            ]:
-                name = path.split(".")[-1]
-                if name not in data[e_name]:
-                    try:
-                        response = find(path, event)
-                    except KeyError:
-                        pass
-                    else:
-                        data[e_name][name] = response
 
-            # Determine state and possibly outcome
+def run_counters(run):
+    """
+    Return list of counters (see RUN_COUNTERS) given tracked run contributes to.
+    """
+    counters = ["total", run.state]  # state is one of pending, running, finished
+    if run.get("outcome") == "failed":
+        counters.append("failed")
+    if run.get("signed") == "true":
+        counters.append("signed_true")
+    elif run.get("signed") == "false":
+        counters.append("signed_false")
+    if run.finalizers is True:
+        counters.append("finalizers_present")
+    elif run.finalizers is False:
+        counters.append("finalizers_absent")
+    if run.deleted is True:
+        counters.append("deleted")
+    if run.terminated is True:
+        counters.append("terminated")
+    if run.get("log", "unknown") != "unknown":
+        counters.append("log_present")
+    if run.get("result", "unknown") != "unknown":
+        counters.append("result_present")
+    if run.get("record", "unknown") != "unknown":
+        counters.append("record_present")
+    if run.get("result_stored") == "true":
+        counters.append("result_stored_true")
+    elif run.get("result_stored") == "false":
+        counters.append("result_stored_false")
+    return counters
+
+
+class LatencyHistogram:
+    """
+    Streaming histogram with logarithmic buckets (HDR-style), so percentiles
+    have bounded relative error (half of the bucket growth, i.e. 1%) while
+    memory stays small. Histograms can be merged.
+    """
+
+    GROWTH = 1.02  # every bucket is this much wider than previous one
+    MIN = 0.001  # values below one millisecond (including negative values caused by clock skew) go to one bucket
+
+    def __init__(self):
+        self.buckets = collections.Counter()
+        self.count = 0
+
+    def add(self, value):
+        if value < self.MIN:
+            bucket = -1
+        else:
+            bucket = int(math.log(value / self.MIN, self.GROWTH))
+        self.buckets[bucket] += 1
+        self.count += 1
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+
+    def percentile(self, p):
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == -1:
+                    return 0.0
+                # Geometric middle of the bucket
+                return round(self.MIN * self.GROWTH ** (bucket + 0.5), 3)
+
+
+class WatchMetrics:
+    """
+    Health of one EventsWatcher: how many events wait in its buffer, how
+    fast they are processed, how often watches had to be restarted (and how
+    many of these restarts were 410 Gone resets needing full relist) and
+    lag histograms. "lag" is from server side timestamp (creation or
+    completion) to our processing of the event that carried it, "queue_lag"
+    is from receiving the event to processing it.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.restarts = 0
+        self.resets = 0
+        self.lag = LatencyHistogram()
+        self.queue_lag = LatencyHistogram()
+        self._last_sample = (time.monotonic(), 0)
+
+    def set_restarts(self, restarts, resets):
+        with self._lock:
+            self.restarts = restarts
+            self.resets = resets
+
+    def watch_restarted(self, reset=False):
+        with self._lock:
+            self.restarts += 1
+            if reset:
+                self.resets += 1
+
+    def events_processed(self, events):
+        """
+        Record batch of processed events, list of (received_at,
+        server_timestamps) tuples.
+        """
+        processed_at = time.time()
+        with self._lock:
+            self.processed += len(events)
+            for received_at, server_timestamps in events:
+                self.queue_lag.add(processed_at - received_at)
+                for ts in server_timestamps:
+                    self.lag.add(processed_at - ts)
+
+    def get(self):
+        """
+        Return current values of WATCH_COUNTERS, events per second are
+        computed since previous call.
+        """
+        now_monotonic = time.monotonic()
+        with self._lock:
+            last_monotonic, last_processed = self._last_sample
+            self._last_sample = (now_monotonic, self.processed)
+            out = {
+                "watch_queue_depth": self._buffer.qsize(),
+                "watch_events_per_second": round(
+                    (self.processed - last_processed)
+                    / max(now_monotonic - last_monotonic, 0.001),
+                    3,
+                ),
+                "watch_restarts": self.restarts,
+                "watch_resets": self.resets,
+            }
+            for name in ("lag", "queue_lag"):
+                for p in LATENCY_PERCENTILES:
+                    out[f"watch_{name}_p{p}"] = getattr(self, name).percentile(p)
+        return out
+
+    def prometheus(self, resource):
+        """
+        Return metrics in Prometheus text exposition format lines.
+        """
+        labels = f'resource="{resource}"'
+        with self._lock:
+            lines = [
+                f"benchmark_watch_queue_depth{{{labels}}} {self._buffer.qsize()}",
+                f"benchmark_watch_events_processed_total{{{labels}}} {self.processed}",
+                f"benchmark_watch_restarts_total{{{labels}}} {self.restarts}",
+                f"benchmark_watch_resets_total{{{labels}}} {self.resets}",
+            ]
+            for name in ("lag", "queue_lag"):
+                histogram = getattr(self, name)
+                for p in (50, 90, 99):
+                    value = histogram.percentile(p)
+                    lines.append(
+                        f'benchmark_watch_{name}_seconds{{{labels},quantile="{p / 100}"}} {"NaN" if value is None else value}'
+                    )
+                lines.append(
+                    f"benchmark_watch_{name}_seconds_count{{{labels}}} {histogram.count}"
+                )
+        return lines
+
+
+PROMETHEUS_HELP = {
+    "benchmark_watch_queue_depth": ("gauge", "Events received but not yet processed"),
+    "benchmark_watch_events_processed_total": ("counter", "Events processed"),
+    "benchmark_watch_restarts_total": ("counter", "Watch restarts"),
+    "benchmark_watch_resets_total": ("counter", "Watch restarts caused by 410 Gone (full relist)"),
+    "benchmark_watch_lag_seconds": ("summary", "From server side timestamp to processing of the event"),
+    "benchmark_watch_queue_lag_seconds": ("summary", "From receiving the event to processing it"),
+}
+
+
+def metrics_server(port, watchers):
+    """
+    Start HTTP server in background thread exposing metrics of watchers
+    (resource => EventsWatcher) in Prometheus text format on /metrics.
+    """
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logging.debug(f"Metrics request: {format % args}")
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            samples = []
+            for resource, watcher in watchers.items():
+                samples += watcher.metrics.prometheus(resource)
+            lines = []
+            for name, (metric_type, description) in PROMETHEUS_HELP.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines += [
+                    s for s in samples if s.split("{", 1)[0] in (name, name + "_count")
+                ]
+            body = ("\n".join(lines) + "\n").encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.name = "metrics_server"
+    thread.start()
+    logging.info(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+
+def latencies_missing(run):
+    """
+    Return names of LATENCIES which end timestamp run does not have yet.
+    """
+    return [name for name, (_, end) in LATENCIES.items() if not hasattr(run, end)]
+
+
+class RunsStats:
+    """
+    Per-namespace counters updated incrementally whenever tracked run changes,
+    so reading them does not require scanning all tracked runs. Also keeps
+    per-namespace histograms of lifecycle latencies (see LATENCIES).
+    """
+
+    def __init__(self):
+        self._counters = collections.defaultdict(collections.Counter)
+        self._latencies = collections.defaultdict(
+            lambda: {name: LatencyHistogram() for name in LATENCIES}
+        )
+
+    def update(self, namespace, before, after):
+        counter = self._counters[namespace]
+        counter.subtract(before)
+        counter.update(after)
+
+    def update_latencies(self, run, names):
+        """
+        Record given latencies of run if we know both its start and end.
+        """
+        for name in names:
+            starts, end = LATENCIES[name]
             try:
-                conditions = find("object.status.conditions", event)
-            except KeyError:
-                data[e_name]["state"] = "pending"
-            else:
-                if conditions[0]["status"] == "Unknown":
-                    data[e_name]["state"] = "running"
-                elif conditions[0]["status"] != "Unknown":
-                    data[e_name]["state"] = "finished"
-
-                    if "finished_at" not in data[e_name]:
-                        data[e_name]["finished_at"] = now()
-
-                    if conditions[0]["type"] == "Succeeded":
-                        if (
-                            conditions[0]["status"] == "True"
-                            and conditions[0]["reason"] == "Succeeded"
-                        ):
-                            data[e_name]["outcome"] = "succeeded"
-                        elif (
-                            conditions[0]["status"] != "True"
-                            and conditions[0]["reason"] != "Succeeded"
-                        ):
-                            data[e_name]["outcome"] = "failed"
-                        else:
-                            data[e_name]["outcome"] = "unknown"
-
-            # Determine finalizers
-            # PRs: chains.tekton.dev/pipelinerun
-            # TRs: chains.tekton.dev
+                end_ts = getattr(run, end)
+            except AttributeError:
+                continue
+            for start in starts:
+                try:
+                    start_ts = getattr(run, start)
+                except AttributeError:
+                    continue
+                self._latencies[run.namespace][name].add(end_ts - start_ts)
+                break
+
+    def get(self, namespace):
+        counter = self._counters[namespace]
+        out = {name: counter[name] for name in RUN_COUNTERS}
+        for name, histogram in self._latencies[namespace].items():
+            for p in LATENCY_PERCENTILES:
+                out[f"{name}_p{p}"] = histogram.percentile(p)
+        return out
+
+    def get_latencies(self):
+        """
+        Return latency percentiles merged across all namespaces.
+        """
+        out = {}
+        for name in LATENCIES:
+            merged = LatencyHistogram()
+            for histograms in self._latencies.values():
+                merged.merge(histograms[name])
+            out[name] = {
+                "count": merged.count,
+                "p50": merged.percentile(50),
+                "p90": merged.percentile(90),
+                "p99": merged.percentile(99),
+            }
+        return out
+
+
+class RecordsStream:
+    """
+    Append records of runs that reached terminal state (finished or deleted)
+    to newline-delimited JSON file whenever they change, so collected data
+    are usable even if we get killed. Later line for the same run
+    supersedes earlier ones. Summary line is written at the end.
+    """
+
+    def __init__(self, path, fsync_interval, append=False):
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+        self._fd = open(path, "a" if append else "w")
+
+    def _write(self, line):
+        with self._lock:
+            self._fd.write(json.dumps(line) + "\n")
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fd.flush()
+                os.fsync(self._fd.fileno())
+                self._last_fsync = time.monotonic()
+
+    def write(self, kind, name, record):
+        self._write({"kind": kind, "name": name, "record": record.to_dict()})
+
+    def write_summary(self, summary):
+        self._write({"kind": "summary", "summary": summary})
+
+    def close(self):
+        self._fd.close()
+
+
+def save_checkpoint(path, monitoring_start, stores, creator):
+    """
+    Atomically save everything we need to continue interrupted benchmark
+    into gzipped JSON file. Stores is a dict of kind => (records, lock,
+    watcher).
+    """
+    started = time.monotonic()
+    state = {
+        "saved_at": time.time(),
+        "monitoring_start": monitoring_start.isoformat(),
+        "creator": creator.to_state(),
+    }
+    for kind, (data, lock, watcher) in stores.items():
+        # Take resource versions first: resuming from older version only
+        # replays some events we already have, newer would lose some
+        resource_versions = dict(watcher.resource_versions)
+        with lock:
+            records = {name: record.to_state() for name, record in data.items()}
+        state[kind] = {"resource_versions": resource_versions, "records": records}
+
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt") as fd:
+        json.dump(state, fd)
+    os.replace(tmp_path, path)
+    logging.info(
+        f"Saved checkpoint to {path} in {time.monotonic() - started:.2f} seconds"
+    )
+
+
+def load_checkpoint(path, stores, creator):
+    """
+    Load checkpoint saved by save_checkpoint into given stores (kind =>
+    (records, stats, watcher)) and creator. Returns monitoring start.
+    """
+    with gzip.open(path, "rt") as fd:
+        state = json.load(fd)
+    for kind, (data, stats, watcher) in stores.items():
+        for name, record_state in state[kind]["records"].items():
+            record = data[name] = RunRecord.from_state(record_state)
+            if hasattr(record, "state"):
+                stats.update(record.namespace, [], run_counters(record))
+            stats.update_latencies(record, LATENCIES)
+        watcher.resource_versions.update(state[kind]["resource_versions"])
+        logging.info(
+            f"Loaded {len(data)} {kind} from checkpoint, resuming watch from {watcher.resource_versions}"
+        )
+    creator.from_state(state["creator"])
+    return datetime.datetime.fromisoformat(state["monitoring_start"])
+
+
+def checkpoint_thread(args, monitoring_start, stores, creator, stop_event):
+    while not stop_event.wait(args.checkpoint_interval):
+        save_checkpoint(args.checkpoint_file, monitoring_start, stores, creator)
+
+
+def is_terminal(run):
+    return run.state == "finished" or run.deleted is True
+
+
+def write_output_file(path, pipelineruns, taskruns):
+    """
+    Write all records into one JSON file, record by record, so we do not
+    need to build the whole document in memory first.
+    """
+    with open(path, "w") as fd:
+        fd.write("{")
+        for kind_idx, (kind, data) in enumerate(
+            (("pipelineruns", pipelineruns), ("taskruns", taskruns))
+        ):
+            if kind_idx > 0:
+                fd.write(", ")
+            fd.write(json.dumps(kind) + ": {")
+            for idx, (name, record) in enumerate(data.items()):
+                if idx > 0:
+                    fd.write(", ")
+                fd.write(json.dumps(name) + ": " + json.dumps(record.to_dict()))
+            fd.write("}")
+        fd.write("}")
+
+
+def process_event(event, data, stats, kind, records_stream, creation_times=None):
+    """
+    Update tracked run with information from the event. Caller has to hold
+    lock protecting data and stats (and creation_times, name => when we
+    asked for and created the run, see PipelineRunsCreator). Returns newly
+    seen server side timestamps (to measure watch lag) or None if event was
+    skipped.
+    """
+    try:
+        # Generate unique name to avoid duplicates due to same object names in multiple-namespaces
+        e_namespace = find("object.metadata.namespace", event)
+        e_name = e_namespace + "." + find("object.metadata.name", event)
+    except KeyError as e:
+        logging.warning(f"Missing name in {json.dumps(event)}: {e} => skipping it")
+        return None
+
+    logging.debug(f"Processing {event['type']} event for {e_name}")
+
+    received_at = event["received_at"]
+    server_timestamps = []  # newly seen server side timestamps, to measure watch lag
+
+    try:
+        record = data[e_name]
+    except KeyError:
+        record = data[e_name] = RunRecord(e_namespace)
+        # PipelineRunsCreator might have created the run before we saw it
+        if creation_times is not None and e_name in creation_times:
+            record.requested_at, record.created_at = creation_times.pop(e_name)
+    before = run_counters(record) if hasattr(record, "state") else []
+    missing = latencies_missing(record)
+
+    # Events coalesced into this one might have seen some milestones first
+    for name, at in event.get("first_seen", {}).items():
+        if not hasattr(record, name):
+            setattr(record, name, at)
+
+    # Collect timestamps if we do not have it already
+    for path in [
+        "object.metadata.creationTimestamp",
+        "object.metadata.deletionTimestamp",
+        "object.status.startTime",
+        "object.status.completionTime",
+    ]:
+        name = path.split(".")[-1]
+        if not hasattr(record, name):
             try:
-                finalizers = find("object.metadata.finalizers", event)
+                response = find(path, event)
             except KeyError:
-                if "finalizer" not in data[e_name]:
-                    data[e_name]["finalizers"] = None
+                pass
             else:
-                if "finalizers_at" not in data[e_name]:
-                    data[e_name]["finalizers_at"] = now()
+                setattr(record, name, str2ts(response))
+                if event["type"] != "MY_INITIAL_SYNC":
+                    server_timestamps.append(getattr(record, name))
+
+    # Determine state and possibly outcome
+    try:
+        conditions = find("object.status.conditions", event)
+    except KeyError:
+        record.state = "pending"
+    else:
+        if conditions[0]["status"] == "Unknown":
+            record.state = "running"
+        elif conditions[0]["status"] != "Unknown":
+            record.state = "finished"
+
+            if not hasattr(record, "finished_at"):
+                record.finished_at = received_at
+
+            if conditions[0]["type"] == "Succeeded":
                 if (
-                    "chains.tekton.dev/pipelinerun" in finalizers
-                    or "chains.tekton.dev" in finalizers
+                    conditions[0]["status"] == "True"
+                    and conditions[0]["reason"] == "Succeeded"
+                ):
+                    record.outcome = "succeeded"
+                elif (
+                    conditions[0]["status"] != "True"
+                    and conditions[0]["reason"] != "Succeeded"
                 ):
-                    data[e_name]["finalizers"] = True
+                    record.outcome = "failed"
                 else:
-                    data[e_name]["finalizers"] = False
+                    record.outcome = "unknown"
 
-            # Determine signature
-            try:
-                annotations = find("object.metadata.annotations", event)
-            except KeyError:
-                for _, key in TEKTON_ANNOTATIONS_TO_CAPTURE:
-                    if key not in data[e_name]:
-                        data[e_name][key] = "unknown"
-            else:
-                # Capture annotations from Chains, Tekton Results
-                for annotation, key in TEKTON_ANNOTATIONS_TO_CAPTURE:
-                    if annotation in annotations:
-                        if key + "_at" not in data[e_name]:
-                            data[e_name][key + "_at"] = now()
-                        data[e_name][key] = annotations[annotation]
-
-            # Determine deleted status
-            if event["type"] == "DELETED":
-                data[e_name]["deleted"] = True
-                if "deleted_at" not in data[e_name]:
-                    data[e_name]["deleted_at"] = now()
-            else:
-                data[e_name]["deleted"] = False
+    # Determine finalizers
+    # PRs: chains.tekton.dev/pipelinerun
+    # TRs: chains.tekton.dev
+    try:
+        finalizers = find("object.metadata.finalizers", event)
+    except KeyError:
+        record.finalizers = None
+    else:
+        if not hasattr(record, "finalizers_at"):
+            record.finalizers_at = received_at
+        if (
+            "chains.tekton.dev/pipelinerun" in finalizers
+            or "chains.tekton.dev" in finalizers
+        ):
+            record.finalizers = True
+        else:
+            record.finalizers = False
 
-            # Determine terminated status
-            if "deletionTimestamp" in data[e_name]:
-                data[e_name]["terminated"] = True
-            else:
-                data[e_name]["terminated"] = False
+    # Determine signature
+    try:
+        annotations = find("object.metadata.annotations", event)
+    except KeyError:
+        annotations = None
+    if annotations is None or event.get("annotations_missing", False):
+        for _, key in TEKTON_ANNOTATIONS_TO_CAPTURE:
+            if not hasattr(record, key):
+                setattr(record, key, "unknown")
+    if annotations is not None:
+        # Capture annotations from Chains, Tekton Results
+        for annotation, key in TEKTON_ANNOTATIONS_TO_CAPTURE:
+            if annotation in annotations:
+                if not hasattr(record, key + "_at"):
+                    setattr(record, key + "_at", received_at)
+                value = annotations[annotation]
+                if value in ("true", "false"):
+                    value = sys.intern(value)
+                setattr(record, key, value)
+
+    # Determine deleted status
+    if event["type"] == "DELETED":
+        record.deleted = True
+        if not hasattr(record, "deleted_at"):
+            record.deleted_at = received_at
+    else:
+        record.deleted = False
+
+    # Determine terminated status
+    record.terminated = hasattr(record, "deletionTimestamp")
+
+    after = run_counters(record)
+    stats.update(e_namespace, before, after)
+    stats.update_latencies(record, missing)
+
+    if records_stream is not None and is_terminal(record) and before != after:
+        records_stream.write(kind, e_name, record)
+
+    return server_timestamps
+
+
+def process_events_thread(watcher, data, stats, lock, kind, records_stream, batch_size, creation_times=None):
+    """
+    Process events from the watcher in batches, holding the lock once per
+    batch instead of once per event.
+    """
+    watcher.start()
+    while True:
+        try:
+            batch = watcher.next_batch(batch_size)
+        except StopIteration:
+            return
+        if len(batch) == 0:
+            continue
+
+        processed = []  # (received_at, server_timestamps) for watch metrics
+        with lock:
+            for event in batch:
+                server_timestamps = process_event(
+                    event, data, stats, kind, records_stream, creation_times
+                )
+                if server_timestamps is not None:
+                    processed.append((event["received_at"], server_timestamps))
+        watcher.metrics.events_processed(processed)
 
 
 class PropagatingThread(threading.Thread):
@@ -390,19 +1465,406 @@ class PropagatingThread(threading.Thread):
         return self.ret
 
 
-def start_pipelinerun_thread(body, namespace):
-    logging.debug("Starting PipelineRun creation")
-    kubernetes.config.load_kube_config()
-    api_instance = kubernetes.client.CustomObjectsApi()
-    kwargs = {
-        "group": "tekton.dev",
-        "version": "v1",
-        "namespace": namespace,
-        "plural": "pipelineruns",
-        "_request_timeout": 300,  # client timeout
-    }
-    response = api_instance.create_namespaced_custom_object(body=body, **kwargs)
-    logging.debug(f"Created PipelineRun: {json.dumps(response)[:100]}...")
+def percentile(sorted_values, p):
+    """
+    Return p-th percentile (nearest-rank) of already sorted list of values.
+    """
+    if len(sorted_values) == 0:
+        return None
+    idx = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+class PipelineRunsCreator:
+    """
+    Create PipelineRuns from a bounded pool of worker threads that share one
+    API client (and so one connection pool), so callers do not have to wait
+    for creations to finish.
+    """
+
+    def __init__(self, workers, records, records_lock):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._records = records  # tracked runs, updated by the watch
+        self._records_lock = records_lock
+        # When we asked for and created runs the watch did not see yet:
+        # name => (requested_at, created_at), moved to the record by
+        # process_event, so we do not track runs without their state
+        self.creation_times = {}
+        self._lock = threading.Lock()
+        self.in_flight = collections.Counter()  # submitted and not yet created, per namespace
+        self.started_worked = 0
+        self.started_failed = 0
+        self.latencies = []  # how long each creation request took in seconds
+        # Progress of open-loop load (see arrivals_thread), kept in checkpoints
+        self.arrivals_created = collections.Counter()  # per namespace
+        self.arrivals_elapsed = 0.0  # seconds of arrival schedule already played
+        self._arrivals_start = None  # epoch time when the schedule would have started
+
+        kubernetes.config.load_kube_config()
+        configuration = kubernetes.client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = workers
+        self._api_instance = kubernetes.client.CustomObjectsApi(
+            kubernetes.client.ApiClient(configuration)
+        )
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="creator"
+        )
+
+    def submit(self, body, namespace, requested_at=None):
+        """
+        Queue creation of the PipelineRun. Optional requested_at is epoch
+        time when the run should have been created according to the load
+        schedule, it defaults to now.
+        """
+        if requested_at is None:
+            requested_at = time.time()
+        with self._lock:
+            self.in_flight[namespace] += 1
+        self._executor.submit(self._create, body, namespace, requested_at)
+
+    def _create(self, body, namespace, requested_at):
+        kwargs = {
+            "group": "tekton.dev",
+            "version": "v1",
+            "namespace": namespace,
+            "plural": "pipelineruns",
+            "_request_timeout": 300,  # client timeout
+        }
+        started = time.monotonic()
+        try:
+            response = self._api_instance.create_namespaced_custom_object(
+                body=body, **kwargs
+            )
+        except Exception:
+            self.logger.exception(f"PipelineRun creation failed in {namespace}")
+            worked = False
+        else:
+            created_at = time.time()
+            e_name = namespace + "." + response["metadata"]["name"]
+            self.logger.debug(f"Created PipelineRun {e_name}")
+            with self._records_lock:
+                try:
+                    record = self._records[e_name]
+                except KeyError:
+                    self.creation_times[e_name] = (requested_at, created_at)
+                else:
+                    record.requested_at = requested_at
+                    record.created_at = created_at
+            worked = True
+        duration = time.monotonic() - started
+
+        with self._lock:
+            self.in_flight[namespace] -= 1
+            self.latencies.append(duration)
+            if worked:
+                self.started_worked += 1
+            else:
+                self.started_failed += 1
+
+    def arrivals_resume(self):
+        """
+        Start playing the arrival schedule where we stopped before (from
+        the start for new benchmark). Returns epoch time when the schedule
+        would have started if it was never interrupted.
+        """
+        with self._lock:
+            self._arrivals_start = time.time() - self.arrivals_elapsed
+            return self._arrivals_start
+
+    def arrivals_pause(self):
+        with self._lock:
+            if self._arrivals_start is not None:
+                self.arrivals_elapsed = time.time() - self._arrivals_start
+                self._arrivals_start = None
+
+    def arrival_submitted(self, namespace):
+        with self._lock:
+            self.arrivals_created[namespace] += 1
+
+    def latency_percentiles(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+        return {
+            "count": len(latencies),
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if len(latencies) > 0 else None,
+        }
+
+    def to_state(self):
+        with self._records_lock:
+            creation_times = dict(self.creation_times)
+        with self._lock:
+            if self._arrivals_start is not None:
+                arrivals_elapsed = time.time() - self._arrivals_start
+            else:
+                arrivals_elapsed = self.arrivals_elapsed
+            return {
+                "started_worked": self.started_worked,
+                "started_failed": self.started_failed,
+                "latencies": list(self.latencies),
+                "creation_times": creation_times,
+                "arrivals": {
+                    "elapsed": arrivals_elapsed,
+                    "created": dict(self.arrivals_created),
+                },
+            }
+
+    def from_state(self, state):
+        with self._lock:
+            self.started_worked = state["started_worked"]
+            self.started_failed = state["started_failed"]
+            self.latencies = state["latencies"]
+            # Checkpoints from older versions do not have it
+            arrivals = state.get("arrivals", {})
+            self.arrivals_elapsed = arrivals.get("elapsed", 0.0)
+            self.arrivals_created = collections.Counter(arrivals.get("created", {}))
+        with self._records_lock:
+            self.creation_times.update(
+                (name, tuple(times))
+                for name, times in state.get("creation_times", {}).items()
+            )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class StatsWriter:
+    """
+    Keeps stats file open for the whole run and writes rows to it buffered,
+    flushing and fsyncing them every fsync_interval seconds.
+
+    Supported formats are "csv" (appends to existing file), "ndjson" (one
+    JSON object per line, appends too) and "parquet" (needs pyarrow, each
+    flush writes one row group, existing file is replaced).
+    """
+
+    def __init__(self, path, fmt, columns, fsync_interval):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.fmt = fmt
+        self.columns = columns
+        self.fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        self._rows = []  # rows waiting for next parquet row group
+
+        if self.fmt == "parquet":
+            import pyarrow
+            import pyarrow.parquet
+
+            self._pyarrow = pyarrow
+            types = {
+                "string": pyarrow.string(),
+                "float": pyarrow.float64(),
+                "int": pyarrow.int64(),
+            }
+            self._schema = pyarrow.schema(
+                [(c, types[stats_column_type(c)]) for c in self.columns]
+            )
+            self._fd = None
+            self._parquet_writer = None
+        else:
+            self._fd = open(self.path, "a", newline="")
+            if self.fmt == "csv":
+                self._csvwriter = csv.writer(self._fd)
+                if self._fd.tell() == 0:
+                    self._csvwriter.writerow(self.columns)
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self._csvwriter.writerow([row[c] for c in self.columns])
+        elif self.fmt == "ndjson":
+            self._fd.write(json.dumps({c: row[c] for c in self.columns}) + "\n")
+        else:
+            self._rows.append({c: row[c] for c in self.columns})
+
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.flush()
+
+    def flush(self):
+        if self.fmt == "parquet":
+            if len(self._rows) > 0:
+                table = self._pyarrow.Table.from_pylist(
+                    self._rows, schema=self._schema
+                )
+                if self._parquet_writer is None:
+                    self._parquet_writer = self._pyarrow.parquet.ParquetWriter(
+                        self.path, self._schema
+                    )
+                self._parquet_writer.write_table(table)
+                self._rows = []
+        else:
+            self._fd.flush()
+            os.fsync(self._fd.fileno())
+        self._last_fsync = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self.fmt == "parquet":
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+        else:
+            self._fd.close()
+
+
+def load_run(args):
+    """
+    Load PipelineRun we are going to create, stamping --run-label on it.
+    """
+    with open(args.run, "r") as fd:
+        run = yaml.load(fd, Loader=yaml.Loader)
+    if args.run_label is not None:
+        key, value = args.run_label.split("=", 1)
+        run.setdefault("metadata", {}).setdefault("labels", {})[key] = value
+    return run
+
+
+def benchmark_namespaces(args):
+    """
+    Return names of namespaces we are benchmarking.
+    """
+    # Use "benchmark" as default namespace to handle backward compatibility for test-scenarios
+    if args.namespace == 1:
+        return [NAMESPACE_NAME_FORMAT.format(idx="")]
+    return [
+        NAMESPACE_NAME_FORMAT.format(idx=str(namespace_idx))
+        for namespace_idx in range(1, args.namespace + 1)
+    ]
+
+
+def fetch_arrival_schedule(value):
+    """
+    Load open-loop load schedule. Value is either a number (constant rate
+    of PipelineRuns per second per namespace, forever) or a YAML file with
+    a list of segments, e.g.:
+
+        - {type: constant, rate: 0.5, duration: 600}
+        - {type: poisson, rate: 1, duration: 600}
+        - {type: ramp, from: 0.1, to: 2, duration: 1800}
+        - {type: step, rates: [1, 2, 4], duration: 300}
+
+    Rates are per namespace, durations in seconds (for step segment it is
+    duration of every rate). Last constant or poisson segment can omit
+    duration to run until benchmark ends.
+    """
+    try:
+        schedule = [{"type": "constant", "rate": float(value), "duration": None}]
+    except ValueError:
+        with open(value, "r") as fd:
+            schedule = yaml.safe_load(fd)
+
+    def is_number(x):
+        return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+    def is_positive(x):
+        return is_number(x) and x > 0
+
+    if not isinstance(schedule, list) or len(schedule) == 0:
+        raise ValueError(f"Arrival schedule has to be non-empty list of segments, got {schedule}")
+    for idx, segment in enumerate(schedule):
+        if not isinstance(segment, dict) or segment.get("type") not in ("constant", "poisson", "ramp", "step"):
+            raise ValueError(f"Unknown arrival schedule segment {segment}")
+        if segment["type"] in ("constant", "poisson") and not is_positive(segment.get("rate")):
+            raise ValueError(f"Arrival schedule segment needs positive rate {segment}")
+        if segment["type"] == "step":
+            rates = segment.get("rates")
+            if not isinstance(rates, list) or len(rates) == 0 or not all(is_positive(r) for r in rates):
+                raise ValueError(f"Step arrival schedule segment needs non-empty list of positive rates {segment}")
+            if segment.get("duration") is None:
+                raise ValueError(f"Step arrival schedule segment needs duration {segment}")
+        if segment["type"] == "ramp":
+            if not all(is_number(segment.get(k)) and segment[k] >= 0 for k in ("from", "to")):
+                raise ValueError(f"Ramp arrival schedule segment needs non-negative from and to {segment}")
+            if segment.get("duration") is None:
+                raise ValueError(f"Ramp arrival schedule segment needs duration {segment}")
+        if segment.get("duration") is None:
+            if idx != len(schedule) - 1:
+                raise ValueError(f"Only last arrival schedule segment can omit duration {segment}")
+        elif not is_positive(segment["duration"]):
+            raise ValueError(f"Arrival schedule segment needs positive duration {segment}")
+    return schedule
+
+
+def arrival_offsets(schedule, rng):
+    """
+    Yield times (seconds since start) when PipelineRuns should be created
+    according to the schedule.
+    """
+    offset = 0.0  # when current part of the schedule starts
+    for segment in schedule:
+        duration = segment.get("duration")
+        if segment["type"] == "step":
+            parts = [(rate, duration) for rate in segment["rates"]]
+        else:
+            parts = [(segment.get("rate"), duration)]
+
+        for rate, part_duration in parts:
+            part_end = math.inf if part_duration is None else offset + part_duration
+            if segment["type"] == "ramp":
+                # Rate grows linearly, so expected number of arrivals by time t
+                # is a*t^2 + b*t; k-th arrival is where that reaches k
+                a = (segment["to"] - segment["from"]) / (2 * part_duration)
+                b = segment["from"]
+                k = 1
+                while True:
+                    if a == 0:
+                        t = k / b if b > 0 else math.inf
+                    elif b * b + 4 * a * k < 0:
+                        break  # decreasing rate will never give us k-th arrival
+                    else:
+                        t = (-b + math.sqrt(b * b + 4 * a * k)) / (2 * a)
+                    if offset + t >= part_end:
+                        break
+                    yield offset + t
+                    k += 1
+            elif rate > 0:
+                t = offset
+                while True:
+                    if segment["type"] == "poisson":
+                        t += rng.expovariate(rate)
+                    else:
+                        t += 1 / rate
+                    if t >= part_end:
+                        break
+                    yield t
+            offset = part_end
+
+
+def arrivals_thread(args, namespaces, creator, stop_event):
+    """
+    Open-loop load: create PipelineRuns according to the arrival schedule,
+    no matter how many of them are already running. With --resume it
+    continues where the interrupted benchmark stopped.
+    """
+    schedule = fetch_arrival_schedule(args.arrival_schedule)
+    run_to_start = load_run(args)
+    created = creator.arrivals_created
+    already_created = dict(created)
+
+    def namespace_arrivals(namespace):
+        # Every namespace have its own reproducible sequence of arrivals, so
+        # we skip the ones created before we were interrupted
+        offsets = arrival_offsets(schedule, random.Random(namespace))
+        for offset in itertools.islice(offsets, already_created.get(namespace, 0), None):
+            yield offset, namespace
+
+    start = creator.arrivals_resume()
+    try:
+        arrivals = heapq.merge(*[namespace_arrivals(n) for n in namespaces])
+        for offset, namespace in arrivals:
+            if created[namespace] >= args.total:
+                if all(created[n] >= args.total for n in namespaces):
+                    logging.info("Created --total PipelineRuns in all namespaces")
+                    return
+                continue
+            if stop_event.wait(max(0, start + offset - time.time())):
+                return
+            creator.submit(run_to_start, namespace, requested_at=start + offset)
+            creator.arrival_submitted(namespace)
+        logging.warning("Arrival schedule finished, not creating more PipelineRuns")
+    finally:
+        creator.arrivals_pause()
 
 
 def fetch_current_concurrency(value):
@@ -419,317 +1881,99 @@ def fetch_current_concurrency(value):
             logging.error(f"File '{value}' does not contain a valid integer")
 
 
-def counter_thread(args, pipelineruns, pipelineruns_lock, taskruns, taskruns_lock):
-    monitoring_start = now()
-    started_worked = 0
-    started_failed = 0
-
+def counter_thread(
+    args,
+    monitoring_start,
+    pipelineruns_stats,
+    pipelineruns_lock,
+    taskruns_stats,
+    taskruns_lock,
+    creator,
+    stats_writer,
+    pipelineruns_watcher,
+    taskruns_watcher,
+):
     # Used to check if --wait-for-state has reached across all namespaces
     namespace_wait_for_state_completed = set()
 
-    if fetch_current_concurrency(args.concurrent) > 0:
-        with open(args.run, "r") as fd:
-            run_to_start = yaml.load(fd, Loader=yaml.Loader)
+    if (
+        args.arrival_schedule is None
+        and fetch_current_concurrency(args.concurrent) > 0
+    ):
+        run_to_start = load_run(args)
 
     while True:
-        for namespace_idx in range(1, args.namespace + 1):
+        # Watch metrics are per resource, same for all namespaces
+        prs_watch = pipelineruns_watcher.metrics.get()
+        trs_watch = taskruns_watcher.metrics.get()
+        logging.info(f"PipelineRuns watch: {json.dumps(prs_watch)}")
+        logging.info(f"TaskRuns watch: {json.dumps(trs_watch)}")
+
+        for namespace in benchmark_namespaces(args):
             monitoring_now = now()
             monitoring_second = (monitoring_now - monitoring_start).total_seconds()
 
-            namespace = NAMESPACE_NAME_FORMAT.format(idx=str(namespace_idx))
-            # Use "benchmark" as default namespace to handle backward compatibility for test-scenarios
-            if args.namespace == 1:
-                namespace = NAMESPACE_NAME_FORMAT.format(idx="")
-
             with pipelineruns_lock:
-                namespaced_pipelineruns = [
-                    i for i in pipelineruns.values() if i["namespace"] == namespace
-                ]
-                total = len(namespaced_pipelineruns)
-                finished = len(
-                    [i for i in namespaced_pipelineruns if i["state"] == "finished"] # Successful Runs + Failed Runs (except runnning)
-                )
-                running = len(
-                    [i for i in namespaced_pipelineruns if i["state"] == "running"]
-                )
-                failed = len(
-                    [i for i in namespaced_pipelineruns if "outcome" in i and i["outcome"] == "failed"]
-                )
-                pending = len(
-                    [i for i in namespaced_pipelineruns if i["state"] == "pending"]
-                )
-                signed_true = len(
-                    [
-                        i
-                        for i in namespaced_pipelineruns
-                        if "signed" in i and i["signed"] == "true"
-                    ]
-                )
-                signed_false = len(
-                    [
-                        i
-                        for i in namespaced_pipelineruns
-                        if "signed" in i and i["signed"] == "false"
-                    ]
-                )
-                finalizers_present = len(
-                    [i for i in namespaced_pipelineruns if i["finalizers"] is True]
-                )
-                finalizers_absent = len(
-                    [i for i in namespaced_pipelineruns if i["finalizers"] is False]
-                )
-                deleted = len(
-                    [i for i in namespaced_pipelineruns if i["deleted"] is True]
-                )
-                terminated = len(
-                    [i for i in namespaced_pipelineruns if i["terminated"] is True]
-                )
-                log_present = len(
-                    [i for i in namespaced_pipelineruns if "log" in i and i["log"] != 'unknown']
-                )
-                result_present = len(
-                    [i for i in namespaced_pipelineruns if "record" in i and i["record"] != 'unknown']
-                )
-                record_present = len(
-                    [i for i in namespaced_pipelineruns if "result" in i and i["result"] != 'unknown']
-                )
-                result_stored_true = len(
-                    [i for i in namespaced_pipelineruns if "result_stored" in i and i["result_stored"] == 'true']
-                )
-                result_stored_false = len(
-                    [i for i in namespaced_pipelineruns if "result_stored" in i and i["result_stored"] == 'false']
-                )
-            prs = {
-                "monitoring_start": monitoring_start,
-                "monitoring_now": monitoring_now,
-                "monitoring_second": monitoring_second,
-                "finished": finished,
-                "running": running,
-                "failed": failed,
-                "pending": pending,
-                "total": total,
-                "signed_true": signed_true,
-                "signed_false": signed_false,
-                "finalizers_present": finalizers_present,
-                "finalizers_absent": finalizers_absent,
-                "deleted": deleted,
-                "terminated": terminated,
-                "log_present": log_present,
-                "result_present": result_present,
-                "record_present": record_present,
-                "result_stored_true": result_stored_true,
-                "result_stored_false": result_stored_false,
-            }
+                prs = pipelineruns_stats.get(namespace)
+            prs.update(
+                {
+                    "monitoring_start": monitoring_start,
+                    "monitoring_now": monitoring_now,
+                    "monitoring_second": monitoring_second,
+                }
+            )
 
-            if fetch_current_concurrency(args.concurrent) > 0:
+            if (
+                args.arrival_schedule is None
+                and fetch_current_concurrency(args.concurrent) > 0
+            ):
                 _remaining = max(
-                    0, args.total - total
+                    0, args.total - prs["total"]
                 )  # avoid negative number if there is more PRs than what was asked on commandline
-                _needed = fetch_current_concurrency(args.concurrent) - running - pending
+                _needed = (
+                    fetch_current_concurrency(args.concurrent)
+                    - prs["running"]
+                    - prs["pending"]
+                    - creator.in_flight[namespace]
+                )
                 prs["should_be_started"] = min(_needed, _remaining)
             else:
                 prs["should_be_started"] = 0
 
             with taskruns_lock:
-                namespaced_taskruns = [
-                    i for i in taskruns.values() if i["namespace"] == namespace
-                ]
-                total = len(namespaced_taskruns)
-                finished = len(
-                    [i for i in namespaced_taskruns if i["state"] == "finished"]
-                )
-                running = len(
-                    [i for i in namespaced_taskruns if i["state"] == "running"]
-                )
-                failed = len(
-                    [i for i in namespaced_taskruns if "outcome" in i and i["outcome"] == "failed"]
-                )
-                pending = len(
-                    [i for i in namespaced_taskruns if i["state"] == "pending"]
-                )
-                signed_true = len(
-                    [
-                        i
-                        for i in namespaced_taskruns
-                        if "signed" in i and i["signed"] == "true"
-                    ]
-                )
-                signed_false = len(
-                    [
-                        i
-                        for i in namespaced_taskruns
-                        if "signed" in i and i["signed"] == "false"
-                    ]
-                )
-                finalizers_present = len(
-                    [i for i in namespaced_taskruns if i["finalizers"] is True]
-                )
-                finalizers_absent = len(
-                    [i for i in namespaced_taskruns if i["finalizers"] is False]
-                )
-                deleted = len([i for i in namespaced_taskruns if i["deleted"] is True])
-                terminated = len(
-                    [i for i in namespaced_taskruns if i["terminated"] is True]
-                )
-                log_present = len(
-                    [i for i in namespaced_taskruns if "log" in i and i["log"] != 'unknown']
-                )
-                result_present = len(
-                    [i for i in namespaced_taskruns if "result" in i and i["result"] != 'unknown']
-                )
-                record_present = len(
-                    [i for i in namespaced_taskruns if "record" in i and i["record"] != 'unknown']
-                )
-                result_stored_true = len(
-                    [i for i in namespaced_taskruns if "result_stored" in i and i["result_stored"] == 'true']
-                )
-                result_stored_false = len(
-                    [i for i in namespaced_taskruns if "result_stored" in i and i["result_stored"] == 'false']
-                )
-            trs = {
-                "monitoring_start": monitoring_start,
-                "monitoring_now": monitoring_now,
-                "monitoring_second": monitoring_second,
-                "finished": finished,
-                "running": running,
-                "failed": failed,
-                "pending": pending,
-                "total": total,
-                "signed_true": signed_true,
-                "signed_false": signed_false,
-                "finalizers_present": finalizers_present,
-                "finalizers_absent": finalizers_absent,
-                "deleted": deleted,
-                "terminated": terminated,
-                "log_present": log_present,
-                "result_present": result_present,
-                "record_present": record_present,
-                "result_stored_true": result_stored_true,
-                "result_stored_false": result_stored_false,
-            }
+                trs = taskruns_stats.get(namespace)
+            trs.update(
+                {
+                    "monitoring_start": monitoring_start,
+                    "monitoring_now": monitoring_now,
+                    "monitoring_second": monitoring_second,
+                }
+            )
 
             if monitoring_second > args.delay and prs["should_be_started"] > 0:
                 logging.info(
                     f"Creating {prs['should_be_started']} PipelineRuns in {namespace}"
                 )
-                creation_threads = set()
-                started_worked_now = 0
-                started_failed_now = 0
                 for _ in range(prs["should_be_started"]):
-                    future = PropagatingThread(
-                        target=start_pipelinerun_thread, args=[run_to_start, namespace]
-                    )
-                    future.start()
-                    creation_threads.add(future)
-                for future in creation_threads:
-                    try:
-                        future.join()
-                    except:
-                        logging.exception(f"PipelineRun creation failed in {namespace}")
-                        started_failed_now += 1
-                    else:
-                        started_worked_now += 1
-                logging.info(
-                    f"Finished creating {prs['should_be_started']} PipelineRuns in {namespace}: {started_worked_now}/{started_failed_now}"
-                )
-                started_worked += started_worked_now
-                started_failed += started_failed_now
-            prs["started_worked"] = started_worked
-            prs["started_failed"] = started_failed
+                    creator.submit(run_to_start, namespace)
+            prs["started_worked"] = creator.started_worked
+            prs["started_failed"] = creator.started_failed
 
             logging.info(f"PipelineRuns: {json.dumps(prs, cls=DateTimeEncoder)}")
             logging.info(f"TaskRuns: {json.dumps(trs, cls=DateTimeEncoder)}")
 
-            if args.stats_file is not None:
-                if not os.path.isfile(args.stats_file):
-                    with open(args.stats_file, "w") as fd:
-                        csvwriter = csv.writer(fd)
-                        csvwriter.writerow(
-                            [
-                                "namespace",
-                                "monitoring_start",
-                                "monitoring_now",
-                                "monitoring_second",
-                                "prs_total",
-                                "prs_failed",
-                                "prs_pending",
-                                "prs_running",
-                                "prs_finished",
-                                "prs_signed_true",
-                                "prs_signed_false",
-                                "prs_finalizers_present",
-                                "prs_finalizers_absent",
-                                "prs_started_worked",
-                                "prs_started_failed",
-                                "prs_deleted",
-                                "prs_terminated",
-                                "prs_log_present",
-                                "prs_result_present",
-                                "prs_record_present",
-                                "prs_result_stored_true",
-                                "prs_result_stored_false",
-                                "trs_total",
-                                "trs_failed",
-                                "trs_pending",
-                                "trs_running",
-                                "trs_finished",
-                                "trs_signed_true",
-                                "trs_signed_false",
-                                "trs_finalizers_present",
-                                "trs_finalizers_absent",
-                                "trs_deleted",
-                                "trs_terminated",
-                                "trs_log_present",
-                                "trs_result_present",
-                                "trs_record_present",
-                                "trs_result_stored_true",
-                                "trs_result_stored_false",
-                            ]
-                        )
-                with open(args.stats_file, "a") as fd:
-                    csvwriter = csv.writer(fd)
-                    csvwriter.writerow(
-                        [
-                            namespace,
-                            monitoring_start.isoformat(),
-                            monitoring_now.isoformat(),
-                            monitoring_second,
-                            prs["total"],
-                            prs['failed'],
-                            prs["pending"],
-                            prs["running"],
-                            prs["finished"],
-                            prs["signed_true"],
-                            prs["signed_false"],
-                            prs["finalizers_present"],
-                            prs["finalizers_absent"],
-                            prs["started_worked"],
-                            prs["started_failed"],
-                            prs["deleted"],
-                            prs["terminated"],
-                            prs["log_present"],
-                            prs["result_present"],
-                            prs["record_present"],
-                            prs["result_stored_true"],
-                            prs["result_stored_false"],
-                            trs["total"],
-                            trs['failed'],
-                            trs["pending"],
-                            trs["running"],
-                            trs["finished"],
-                            trs["signed_true"],
-                            trs["signed_false"],
-                            trs["finalizers_present"],
-                            trs["finalizers_absent"],
-                            trs["deleted"],
-                            trs["terminated"],
-                            trs["log_present"],
-                            trs["result_present"],
-                            trs["record_present"],
-                            trs["result_stored_true"],
-                            trs["result_stored_false"],
-                        ]
-                    )
+            if stats_writer is not None:
+                row = {
+                    "namespace": namespace,
+                    "monitoring_start": monitoring_start.isoformat(),
+                    "monitoring_now": monitoring_now.isoformat(),
+                    "monitoring_second": monitoring_second,
+                }
+                row.update({"prs_" + k: v for k, v in prs.items()})
+                row.update({"trs_" + k: v for k, v in trs.items()})
+                row.update({"prs_" + k: v for k, v in prs_watch.items()})
+                row.update({"trs_" + k: v for k, v in trs_watch.items()})
+                stats_writer.write(row)
 
             # Add namespace into completion
             if prs[args.wait_for_state] >= args.total:
@@ -752,21 +1996,72 @@ def counter_thread(args, pipelineruns, pipelineruns_lock, taskruns, taskruns_loc
 
             time.sleep(args.delay)
 
+        if creator.started_worked + creator.started_failed > 0:
+            logging.info(
+                f"PipelineRuns creation latency: {json.dumps(creator.latency_percentiles())}"
+            )
+
 
 def doit(args):
     stop_event = threading.Event()
 
-    pipelineruns = collections.defaultdict(dict)
+    pipelineruns = {}
+    pipelineruns_stats = RunsStats()
     pipelineruns_lock = threading.Lock()
-    pipelineruns_watcher = PRsEventsWatcher(args=args, stop_event=stop_event)
+    if args.watch_processes > 0:
+        pipelineruns_watcher = ShardedEventsWatcher(
+            "pipelineruns", args, stop_event, watch_shards(args, args.watch_processes)
+        )
+    else:
+        pipelineruns_watcher = PRsEventsWatcher(args=args, stop_event=stop_event)
 
-    taskruns = collections.defaultdict(dict)
+    taskruns = {}
+    taskruns_stats = RunsStats()
     taskruns_lock = threading.Lock()
-    taskruns_watcher = TRsEventsWatcher(args=args, stop_event=stop_event)
+    if args.watch_processes > 0:
+        taskruns_watcher = ShardedEventsWatcher(
+            "taskruns", args, stop_event, watch_shards(args, args.watch_processes)
+        )
+    else:
+        taskruns_watcher = TRsEventsWatcher(args=args, stop_event=stop_event)
+
+    creator = PipelineRunsCreator(
+        workers=args.creation_workers,
+        records=pipelineruns,
+        records_lock=pipelineruns_lock,
+    )
+
+    if args.resume:
+        monitoring_start = load_checkpoint(
+            args.checkpoint_file,
+            {
+                "pipelineruns": (pipelineruns, pipelineruns_stats, pipelineruns_watcher),
+                "taskruns": (taskruns, taskruns_stats, taskruns_watcher),
+            },
+            creator,
+        )
+    else:
+        monitoring_start = now()
+
+    if args.output_stream is not None:
+        records_stream = RecordsStream(
+            args.output_stream, args.stats_fsync_interval, append=args.resume
+        )
+    else:
+        records_stream = None
 
     pipelineruns_future = PropagatingThread(
         target=process_events_thread,
-        args=[pipelineruns_watcher, pipelineruns, pipelineruns_lock],
+        args=[
+            pipelineruns_watcher,
+            pipelineruns,
+            pipelineruns_stats,
+            pipelineruns_lock,
+            "pipelineruns",
+            records_stream,
+            args.batch_size,
+            creator.creation_times,
+        ],
     )
     pipelineruns_future.name = "pipelineruns_watcher"
     pipelineruns_future.start()
@@ -775,19 +2070,72 @@ def doit(args):
         args=[
             taskruns_watcher,
             taskruns,
+            taskruns_stats,
             taskruns_lock,
+            "taskruns",
+            records_stream,
+            args.batch_size,
         ],
     )
     taskruns_future.name = "taskruns_watcher"
     taskruns_future.start()
+    if args.stats_file is not None:
+        stats_writer = StatsWriter(
+            args.stats_file,
+            args.stats_format,
+            STATS_COLUMNS,
+            args.stats_fsync_interval,
+        )
+    else:
+        stats_writer = None
+
+    checkpoint_stores = {
+        "pipelineruns": (pipelineruns, pipelineruns_lock, pipelineruns_watcher),
+        "taskruns": (taskruns, taskruns_lock, taskruns_watcher),
+    }
+    if args.checkpoint_file is not None:
+        checkpoint_stop_event = threading.Event()
+        checkpoint_future = PropagatingThread(
+            target=checkpoint_thread,
+            args=[
+                args,
+                monitoring_start,
+                checkpoint_stores,
+                creator,
+                checkpoint_stop_event,
+            ],
+        )
+        checkpoint_future.name = "checkpoint_thread"
+        checkpoint_future.start()
+
+    if args.metrics_port is not None:
+        metrics = metrics_server(
+            args.metrics_port,
+            {"pipelineruns": pipelineruns_watcher, "taskruns": taskruns_watcher},
+        )
+
+    if args.arrival_schedule is not None:
+        arrivals_stop_event = threading.Event()
+        arrivals_future = PropagatingThread(
+            target=arrivals_thread,
+            args=[args, benchmark_namespaces(args), creator, arrivals_stop_event],
+        )
+        arrivals_future.name = "arrivals_thread"
+        arrivals_future.start()
+
     counter_future = PropagatingThread(
         target=counter_thread,
         args=[
             args,
-            pipelineruns,
+            monitoring_start,
+            pipelineruns_stats,
             pipelineruns_lock,
-            taskruns,
+            taskruns_stats,
             taskruns_lock,
+            creator,
+            stats_writer,
+            pipelineruns_watcher,
+            taskruns_watcher,
         ],
     )
     counter_future.name = "counter_thread"
@@ -798,6 +2146,22 @@ def doit(args):
     except:
         logging.exception("Counter thread failed")
 
+    if stats_writer is not None:
+        stats_writer.close()
+
+    if args.arrival_schedule is not None:
+        arrivals_stop_event.set()
+        try:
+            arrivals_future.join()
+        except:
+            logging.exception("Arrivals thread failed")
+
+    logging.info("Waiting for PipelineRuns creation to finish")
+    creator.shutdown()
+    logging.info(
+        f"PipelineRuns creation latency: {json.dumps(creator.latency_percentiles())}"
+    )
+
     logging.info("Asking watcher threads to stop")
     pipelineruns_watcher.stop()
     taskruns_watcher.stop()
@@ -805,11 +2169,54 @@ def doit(args):
     pipelineruns_future.join()
     taskruns_future.join()
 
-    with open(args.output_file, "w") as fd:
-        json.dump(
-            {"pipelineruns": pipelineruns, "taskruns": taskruns},
-            fd,
-            cls=DateTimeEncoder,
+    if args.metrics_port is not None:
+        metrics.shutdown()
+
+    if args.checkpoint_file is not None:
+        checkpoint_stop_event.set()
+        try:
+            checkpoint_future.join()
+        except:
+            logging.exception("Checkpoint thread failed")
+        save_checkpoint(
+            args.checkpoint_file, monitoring_start, checkpoint_stores, creator
+        )
+
+    if records_stream is not None:
+        # Runs which did not finish were not written yet
+        for kind, data in (("pipelineruns", pipelineruns), ("taskruns", taskruns)):
+            for name, record in data.items():
+                if not hasattr(record, "state") or not is_terminal(record):
+                    records_stream.write(kind, name, record)
+        records_stream.write_summary(
+            {
+                "pipelineruns": {
+                    namespace: pipelineruns_stats.get(namespace)
+                    for namespace in benchmark_namespaces(args)
+                },
+                "taskruns": {
+                    namespace: taskruns_stats.get(namespace)
+                    for namespace in benchmark_namespaces(args)
+                },
+                "creation_latency": creator.latency_percentiles(),
+                "latencies": {
+                    "pipelineruns": pipelineruns_stats.get_latencies(),
+                    "taskruns": taskruns_stats.get_latencies(),
+                },
+                "watch": {
+                    "pipelineruns": pipelineruns_watcher.metrics.get(),
+                    "taskruns": taskruns_watcher.metrics.get(),
+                },
+            }
+        )
+        records_stream.close()
+
+    write_output_file(args.output_file, pipelineruns, taskruns)
+
+    for kind, data in (("PipelineRuns", pipelineruns), ("TaskRuns", taskruns)):
+        size = records_memory(data)
+        logging.info(
+            f"Tracked {len(data)} {kind} in {size} bytes ({size / max(1, len(data)):.0f} bytes per object)"
         )
 
 
@@ -841,11 +2248,45 @@ def main():
         default=10,
         type=int,
     )
+    parser.add_argument(
+        "--arrival-schedule",
+        help="Open-loop mode: create PipelineRuns at given rate (per second per namespace) no matter how many are in flight. Either a number or a YAML schedule file (constant, poisson, ramp and step segments). Overrides --concurrent.",
+        default=None,
+    )
+    parser.add_argument(
+        "--creation-workers",
+        help="How many PipelineRuns can be created in parallel (size of creation worker pool).",
+        default=50,
+        type=int,
+    )
+    parser.add_argument(
+        "--watch-processes",
+        help="Run watches in this many worker processes per resource type (PipelineRuns, TaskRuns), so decoding events does not compete for GIL with processing. More than 1 needs --watch-namespaced, namespaces are then split between processes by hash of their name. Default 0 watches in threads of the main process.",
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Process up to this many buffered watch events at once (events for the same run are coalesced). Use 1 to process events one by one.",
+        default=1000,
+        type=int,
+    )
     parser.add_argument(
         "--run",
         help="PipelineRun file. Only relevant if we are going to start more PipelineRuns (see --concurrent option).",
         type=str,
     )
+    parser.add_argument(
+        "--run-label",
+        help="Label 'key=value' to add to PipelineRuns we create (Tekton propagates it to TaskRuns). When set, only runs with this label are watched, so unrelated runs in the cluster are filtered on server side.",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--watch-namespaced",
+        help="Instead of one cluster-wide watch per resource, run one watch per benchmark namespace, all feeding same processing.",
+        action="store_true",
+    )
     parser.add_argument(
         "--wait-for-state",
         help="When waiting for '--total <N>' PipelineRuns, count these in this state",
@@ -866,12 +2307,54 @@ def main():
         default="/tmp/benchmark-tekton.csv",
         type=str,
     )
+    parser.add_argument(
+        "--stats-format",
+        help="Format of the stats file. Parquet needs pyarrow installed.",
+        choices=("csv", "ndjson", "parquet"),
+        default="csv",
+        type=str,
+    )
+    parser.add_argument(
+        "--stats-fsync-interval",
+        help="How often (in seconds) to flush and fsync the stats file.",
+        default=10,
+        type=int,
+    )
     parser.add_argument(
         "--output-file",
         help="File where to dump final data",
         default="/tmp/benchmark-tekton.json",
         type=str,
     )
+    parser.add_argument(
+        "--output-stream",
+        help="Newline-delimited JSON file where to append runs as they reach terminal state (and again when they change later), plus summary at the end. Usable even if benchmark gets killed.",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        help="File where to periodically save tracked runs, counters and watch resource versions, so interrupted benchmark can be continued with --resume.",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        help="How often (in seconds) to save the checkpoint.",
+        default=300,
+        type=int,
+    )
+    parser.add_argument(
+        "--resume",
+        help="Load --checkpoint-file and continue interrupted benchmark from there: keep tracked runs and timing data, continue --arrival-schedule where it stopped and restart watches from saved resource versions instead of listing everything again.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        help="Serve watch health metrics (queue depth, processed events, restarts, lag) in Prometheus format on http://127.0.0.1:<port>/metrics.",
+        default=None,
+        type=int,
+    )
     parser.add_argument(
         "--log-file",
         help="Log file (will be rotated if needed)",
@@ -897,6 +2380,22 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.resume and args.checkpoint_file is None:
+        parser.error("--resume needs --checkpoint-file")
+
+    if args.watch_processes > 1 and not args.watch_namespaced:
+        parser.error("--watch-processes more than 1 needs --watch-namespaced")
+
+    if args.run_label is not None and "=" not in args.run_label:
+        parser.error("--run-label have to be in 'key=value' format")
+
+    if args.arrival_schedule is not None:
+        # Fail before the benchmark starts, arrivals thread loads it again
+        try:
+            fetch_arrival_schedule(args.arrival_schedule)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            parser.error(f"--arrival-schedule is not valid: {e}")
+
     if args.debug:
         logger = setup_logger(logging.DEBUG, args.log_file)
     elif args.verbose:
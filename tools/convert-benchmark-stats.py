@@ -7,11 +7,22 @@
 ./convert-benchmark-stats.py <source> <target>
 
 <source>: Path to original benchmark-stats.csv containing namespace field
-<target>: Path to target location to save the new benchmark-stats.csv 
+          (benchmark.py stats file in CSV or NDJSON format)
+<target>: Path to target location to save the new benchmark-stats.csv
+
+Rows of the source file are read one by one and grouped into monitoring
+ticks: benchmark.py writes one row per namespace per tick, so a tick ends
+when a namespace repeats (or when monitoring_start changes, i.e. another
+run was appended to the file). For every tick one row is written with
+counters summed across all namespaces. When a namespace is missing in a
+tick, its last known counters are used. Columns not listed below are
+ignored, missing or empty counters count as 0.
 '''
 
+import array
+import csv
+import json
 import sys
-import math
 
 column_names = [
     'monitoring_start',
@@ -53,97 +64,146 @@ column_names = [
     'trs_result_stored_false',
 ]
 
+counter_names = column_names[3:]
+
+
+def to_int(value):
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if value == '':
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def read_csv(f):
+    reader = csv.reader(f)
+    headers = [x.strip() for x in next(reader, [])]
+    header_col2idx = {headers[i]: i for i in range(len(headers))}
+    if 'namespace' not in header_col2idx:
+        raise ValueError('Stats file does not have namespace column')
+
+    namespace_idx = header_col2idx['namespace']
+    monitoring_idx = [header_col2idx.get(c) for c in column_names[:3]]
+    counter_idx = [header_col2idx.get(c) for c in counter_names]
+
+    for row in reader:
+        if len(row) == 0:
+            continue
+        cells = [x.strip() for x in row] + [''] * (len(headers) - len(row))
+        yield (
+            cells[namespace_idx],
+            *['' if i is None else cells[i] for i in monitoring_idx],
+            array.array('q', [0 if i is None else to_int(cells[i]) for i in counter_idx]),
+        )
+
+
+def read_ndjson(f):
+    for line in f:
+        line = line.strip()
+        if line == '':
+            continue
+        row = json.loads(line)
+        yield (
+            str(row['namespace']),
+            *[str(row.get(c, '')) for c in column_names[:3]],
+            array.array('q', [to_int(row.get(c)) for c in counter_names]),
+        )
+
+
+def read_rows(path):
+    '''
+    Yield (namespace, monitoring_start, monitoring_now, monitoring_second,
+    counters) for every row of the stats file, counters as typed array in
+    order of counter_names. Format is detected from the first character.
+    '''
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == '{':
+            yield from read_ndjson(f)
+        else:
+            yield from read_csv(f)
+
+
+class TickAggregator:
+    '''
+    Running sum of counters across namespaces. Keeps last counters of every
+    namespace, so each row only updates totals by its difference.
+    '''
+
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, monitoring_start):
+        self.monitoring_start = monitoring_start
+        self.last = {}  # namespace => its last counters
+        self.totals = array.array('q', [0] * len(counter_names))
+        self.tick = set()  # namespaces seen in current tick
+        self.tick_start = None
+        self.tick_now = None
+        self.tick_second = None
+
+    def close_tick(self):
+        '''
+        Return output row for current tick (None if it is empty) and start
+        a new one.
+        '''
+        if len(self.tick) == 0:
+            return None
+        result_row = [self.tick_start, self.tick_now, self.tick_second]
+        result_row.extend(self.totals)
+        self.tick = set()
+        return result_row
+
+    def add(self, namespace, monitoring_start, monitoring_now, monitoring_second, counters):
+        '''
+        Add one row, return output row of a tick this row closed or None.
+        '''
+        result_row = None
+        if monitoring_start != self.monitoring_start:
+            result_row = self.close_tick()
+            self.reset(monitoring_start)
+        elif namespace in self.tick:
+            result_row = self.close_tick()
+
+        if len(self.tick) == 0:
+            self.tick_start = monitoring_start
+        self.tick.add(namespace)
+        self.tick_now = monitoring_now
+        self.tick_second = monitoring_second
+
+        previous = self.last.get(namespace)
+        totals = self.totals
+        if previous is None:
+            for i, value in enumerate(counters):
+                totals[i] += value
+        else:
+            for i, value in enumerate(counters):
+                totals[i] += value - previous[i]
+        self.last[namespace] = counters
 
-class CSV_Object:
-    def __init__(self, path):
-        self.load_from_file(path)
-
-    def load_from_file(self, path):
-        with open(path, 'r', encoding='utf-8') as f:
-            data = f.readlines()
-
-            # Fetch Headers
-            self.headers = [x.strip() for x in data[0].split(',')]
-            self.header_col2idx = { 
-                self.headers[i]: i
-                for i in range(len(self.headers))
-            }
-
-            # Fetch data columns
-            data_rows = []
-
-            for data in data[1:]:
-                data_rows.append(
-                    [x.strip() for x in data.split(',')]
-                )
-
-            self.data_rows = data_rows
-            self.row_count = len(data_rows)
-            self.col_count = len(self.headers)
-
-    def __getitem__(self, col_name):
-        result = []
-        for row in self.data_rows:
-            col_val = row[self.header_col2idx[col_name]]
-            result.append(col_val)
-        return result
-
-    def unique(self, col_name):
-        seen = set()
-        result = []
-        for row in self.data_rows:
-            col_val = row[self.header_col2idx[col_name]]
-            if col_val not in seen:
-                seen.add(col_val)
-                result.append(col_val)
-        return result
+        return result_row
 
 
 def main(benchmark_stats_file, out):
-    csv_data = CSV_Object(benchmark_stats_file)
-
-    namespace_count = len(csv_data.unique('namespace'))
-    n = csv_data.row_count
-    result_rows = []
-
-    batches = math.ceil(n // namespace_count)
-
-    for batch in range(batches):
-        # Group by namespaces
-
-        # For last batch, take last nth records based on namespace count as
-        # start index (as we could have less number of records)
-        if batch == batches - 1:
-            start_idx = n - namespace_count
-        else:
-            start_idx = namespace_count * batch
-
-        last_idx = start_idx + namespace_count - 1
-
-        monitoring_start = csv_data['monitoring_start'][start_idx]
-        monitoring_now = csv_data['monitoring_now'][last_idx]
-        monitoring_second = csv_data['monitoring_second'][last_idx]
-
-        result_row = [monitoring_start, monitoring_now, monitoring_second]
-
-        # Sum stats for each measurement column across the namespace
-        for col_name in column_names[3:]:
-            col_values = csv_data[col_name]
-            total_sum = 0
-            for idx in range(start_idx, last_idx + 1):
-                total_sum += int(col_values[idx])
-            result_row.append(total_sum)
-
-        result_rows.append(result_row)
-
-    with open(out, 'w', encoding='utf-8') as file_writer:
-        file_writer.write(",".join(column_names))
-        file_writer.write("\n")
-        for data in result_rows:
-            file_writer.write(",".join([str(x) for x in data]))
-            file_writer.write("\n")
-        file_writer.flush()
-        file_writer.close()
+    aggregator = TickAggregator()
+
+    with open(out, 'w', encoding='utf-8', newline='') as file_writer:
+        writer = csv.writer(file_writer, lineterminator='\n')
+        writer.writerow(column_names)
+        for row in read_rows(benchmark_stats_file):
+            result_row = aggregator.add(*row)
+            if result_row is not None:
+                writer.writerow(result_row)
+        result_row = aggregator.close_tick()
+        if result_row is not None:
+            writer.writerow(result_row)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Run benchmark.py against local fake API server (server.py next to this
+# script) and report its CPU usage, memory usage and how late it noticed
+# lifecycle transitions compared to when the fake server made them.
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK = os.path.join(HERE, "..", "benchmark.py")
+SERVER = os.path.join(HERE, "server.py")
+
+# Lifecycle step in fake server transitions => local timestamp in benchmark.py output
+STEPS = {
+    "finished": "finished_at",
+    "signed": "signed_at",
+    "stored": "result_stored_at",
+    "deleted": "deleted_at",
+}
+
+RUN = """
+apiVersion: tekton.dev/v1
+kind: PipelineRun
+metadata:
+  generateName: fake-run-
+spec:
+  pipelineRef:
+    name: fake
+"""
+
+
+def process_tree(pid):
+    """
+    Return given process and all its descendants (e.g. watch processes).
+    """
+    pids = [pid]
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children", "r") as fd:
+                children = fd.read().split()
+        except FileNotFoundError:
+            continue
+        for child in children:
+            try:
+                pids += process_tree(int(child))
+            except FileNotFoundError:
+                pass
+    return pids
+
+
+def sample_process(pid):
+    """
+    Return (CPU seconds, RSS bytes) of given process and its descendants
+    from /proc.
+    """
+    cpu = 0
+    rss = 0
+    for one_pid in process_tree(pid):
+        try:
+            with open(f"/proc/{one_pid}/stat", "r") as fd:
+                fields = fd.read().rsplit(")", 1)[1].split()
+        except FileNotFoundError:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        rss += int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return cpu, rss
+
+
+def percentile(values, p):
+    if len(values) == 0:
+        return None
+    values = sorted(values)
+    return values[max(0, -(-len(values) * p // 100) - 1)]
+
+
+def compute_lags(transitions, output, since):
+    """
+    For each lifecycle step return list of seconds between fake server doing
+    the transition and benchmark.py registering it. Transitions before
+    since (e.g. preloaded runs) are ignored.
+    """
+    lags = {}
+    for kind, runs in transitions.items():
+        for name, steps in runs.items():
+            record = output.get(kind, {}).get(name)
+            if record is None:
+                continue
+            for step, at in STEPS.items():
+                if step not in steps or steps[step] < since or record.get(at) is None:
+                    continue
+                seen = datetime.datetime.fromisoformat(record[at]).timestamp()
+                lags.setdefault(f"{kind}.{step}", []).append(seen - steps[step])
+    return lags
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run benchmark.py against fake API server and measure its overhead and event lag",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--port", help="Port for the fake server", default=18001, type=int)
+    parser.add_argument("--server-args", help="Extra arguments for server.py", default="")
+    parser.add_argument("--benchmark-args", help="Extra arguments for benchmark.py", default="--concurrent 10 --total 100")
+    parser.add_argument("--namespace", help="How many namespaces to use", default=1, type=int)
+    parser.add_argument("--sample-interval", help="How often to sample benchmark.py CPU and memory (seconds)", default=1.0, type=float)
+    parser.add_argument("--workdir", help="Where to put kubeconfig, outputs and logs, temporary directory by default", default=None)
+    parser.add_argument("--report-file", help="Where to write JSON report", default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", level=logging.INFO)
+
+    workdir = args.workdir if args.workdir is not None else tempfile.mkdtemp(prefix="fake-kube-api-")
+    kubeconfig = os.path.join(workdir, "kubeconfig.yaml")
+    transitions_file = os.path.join(workdir, "transitions.json")
+    output_file = os.path.join(workdir, "benchmark-tekton.json")
+    run_file = os.path.join(workdir, "run.yaml")
+    with open(run_file, "w") as fd:
+        fd.write(RUN)
+
+    server = subprocess.Popen(
+        [
+            sys.executable, SERVER,
+            "--port", str(args.port),
+            "--kubeconfig", kubeconfig,
+            "--transitions-file", transitions_file,
+            "--preload-namespaces", str(args.namespace),
+        ]
+        + args.server_args.split()
+    )
+    while not os.path.exists(kubeconfig):
+        if server.poll() is not None:
+            logging.error("Fake server failed to start")
+            return 1
+        time.sleep(0.1)
+    logging.info(f"Fake server running, working directory {workdir}")
+
+    benchmark_started = time.time()
+    benchmark = subprocess.Popen(
+        [
+            sys.executable, BENCHMARK,
+            "--namespace", str(args.namespace),
+            "--run", run_file,
+            "--delay", "1",
+            "--stats-file", os.path.join(workdir, "benchmark-tekton.csv"),
+            "--output-file", output_file,
+            "--log-file", os.path.join(workdir, "benchmark-tekton.log"),
+        ]
+        + args.benchmark_args.split(),
+        env=dict(os.environ, KUBECONFIG=kubeconfig),
+    )
+
+    samples = []
+    while benchmark.poll() is None:
+        try:
+            samples.append((time.time(),) + sample_process(benchmark.pid))
+        except (FileNotFoundError, ProcessLookupError, IndexError):
+            break
+        time.sleep(args.sample_interval)
+    benchmark.wait()
+    benchmark_duration = time.time() - benchmark_started
+
+    server.send_signal(signal.SIGTERM)
+    server.wait()
+
+    if benchmark.returncode != 0:
+        logging.error(f"benchmark.py exited with {benchmark.returncode}")
+        return 1
+
+    with open(transitions_file, "r") as fd:
+        transitions = json.load(fd)
+    with open(output_file, "r") as fd:
+        output = json.load(fd)
+
+    report = {
+        "benchmark_duration": benchmark_duration,
+        "cpu_seconds": samples[-1][1] if samples else None,
+        "cpu_utilization": samples[-1][1] / benchmark_duration if samples else None,
+        "rss_max": max(s[2] for s in samples) if samples else None,
+        "rss_last": samples[-1][2] if samples else None,
+        "pipelineruns": len(output["pipelineruns"]),
+        "taskruns": len(output["taskruns"]),
+        "lag": {},
+    }
+    for key, values in sorted(compute_lags(transitions, output, benchmark_started).items()):
+        report["lag"][key] = {
+            "count": len(values),
+            "avg": sum(values) / len(values),
+            "p50": percentile(values, 50),
+            "p99": percentile(values, 99),
+            "max": max(values),
+        }
+
+    print(json.dumps(report, indent=4))
+    if args.report_file is not None:
+        with open(args.report_file, "w") as fd:
+            json.dump(report, fd, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Local stand-in for Kubernetes API server good enough to run benchmark.py
+# against it: serves tekton.dev/v1 PipelineRuns and TaskRuns (list with
+# pagination, watch, create) and simulates their lifecycle including Chains
+# signing, Tekton Results annotations and pruning.
+
+import argparse
+import collections
+import heapq
+import http.server
+import json
+import logging
+import random
+import re
+import signal
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+
+PATH_RE = re.compile(
+    r"^/apis/tekton\.dev/v1(?:/namespaces/(?P<namespace>[^/]*))?/(?P<plural>pipelineruns|taskruns)(?:/(?P<name>[^/]+))?$"
+)
+
+KINDS = {"pipelineruns": "PipelineRun", "taskruns": "TaskRun"}
+FINALIZERS = {"pipelineruns": "chains.tekton.dev/pipelinerun", "taskruns": "chains.tekton.dev"}
+
+
+def k8s_time(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+TABLE_COLUMNS = ["Name", "Succeeded", "Reason", "StartTime", "CompletionTime"]
+
+
+def table_cells(obj):
+    """
+    Cells of Table row for the run, following Tekton printer columns.
+    """
+    status = obj.get("status", {})
+    condition = status.get("conditions", [{}])[0]
+    return [
+        obj["metadata"]["name"],
+        condition.get("status", ""),
+        condition.get("reason", ""),
+        status.get("startTime", ""),
+        status.get("completionTime", ""),
+    ]
+
+
+def matches_labels(labels, selector):
+    """
+    Support only simple equality based label selectors: "a=b,c=d".
+    """
+    if not selector:
+        return True
+    for requirement in selector.split(","):
+        key, value = requirement.split("=", 1)
+        if labels.get(key.strip()) != value.strip():
+            return False
+    return True
+
+
+class Cluster:
+    """
+    Objects, resource versions, history of events for watches and the
+    simulation of runs lifecycle.
+    """
+
+    def __init__(self, args):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.condition = threading.Condition()
+        self.resource_version = 1
+        self.objects = {"pipelineruns": {}, "taskruns": {}}
+        # PipelineRun key => its TaskRun keys (dict to keep creation order)
+        self.children = {}
+        # History of events we can replay to watches: (rv, plural, namespace, labels, line)
+        self.events = collections.deque(maxlen=args.event_history)
+        self.schedule = []  # heap of (when, seq, plural, key, step)
+        self.seq = 0
+        # When each lifecycle step of each object happened: plural => "namespace.name" => step => epoch
+        self.transitions = {"pipelineruns": {}, "taskruns": {}}
+
+    def _emit(self, event_type, plural, obj):
+        """
+        Bump resource version, store event in history and wake up watches.
+        Has to be called with self.condition held.
+        """
+        self.resource_version += 1
+        obj["metadata"]["resourceVersion"] = str(self.resource_version)
+        line = json.dumps({"type": event_type, "object": obj}).encode() + b"\n"
+        self.events.append(
+            (
+                self.resource_version,
+                plural,
+                obj["metadata"]["namespace"],
+                obj["metadata"].get("labels", {}),
+                line,
+            )
+        )
+        self.condition.notify_all()
+
+    def _schedule(self, delay, plural, key, step):
+        self.seq += 1
+        heapq.heappush(self.schedule, (time.time() + delay, self.seq, plural, key, step))
+
+    def _note(self, plural, key, step):
+        self.transitions[plural].setdefault(f"{key[0]}.{key[1]}", {})[step] = time.time()
+
+    def create(self, plural, namespace, body):
+        # Serialize under the lock as simulation keeps modifying the object
+        with self.condition:
+            return json.dumps(self._create(plural, namespace, body)).encode()
+
+    def _create(self, plural, namespace, body):
+        metadata = body.setdefault("metadata", {})
+        if "name" not in metadata:
+            metadata["name"] = metadata.get("generateName", "run-") + uuid.uuid4().hex[:5]
+        metadata["namespace"] = namespace
+        metadata["uid"] = str(uuid.uuid4())
+        metadata["creationTimestamp"] = k8s_time(time.time())
+        body["kind"] = KINDS[plural]
+        body["apiVersion"] = "tekton.dev/v1"
+        key = (namespace, metadata["name"])
+        self.objects[plural][key] = body
+        if plural == "taskruns":
+            pr_name = metadata.get("labels", {}).get("tekton.dev/pipelineRun")
+            if pr_name is not None:
+                self.children.setdefault((namespace, pr_name), {})[key] = None
+        self._note(plural, key, "created")
+        self._emit("ADDED", plural, body)
+        if plural == "pipelineruns":
+            self._schedule(self.args.pending, plural, key, "start")
+        return body
+
+    def preload(self, count, namespaces):
+        """
+        Create count already finished (signed, stored) PipelineRuns with
+        their TaskRuns, i.e. leftovers from previous runs. Meant to be called
+        before the simulation starts.
+        """
+        with self.condition:
+            for idx in range(count):
+                namespace = namespaces[idx % len(namespaces)]
+                key = (namespace, f"preloaded-{idx}")
+                self._create("pipelineruns", namespace, {"metadata": {"name": key[1], "labels": {"fake": "preloaded"}}})
+                self._start("pipelineruns", key)
+                self._finish("pipelineruns", key, succeeded=True)
+            self.schedule = []
+            for plural, objects in self.objects.items():
+                for key in objects:
+                    if self.args.sign_delay >= 0:
+                        self._sign(plural, key)
+                    if self.args.results_delay >= 0:
+                        self._store(plural, key)
+        self.logger.info(f"Preloaded {count} PipelineRuns")
+
+    def _start(self, plural, key):
+        obj = self.objects[plural][key]
+        now = time.time()
+        obj["status"] = {
+            "startTime": k8s_time(now),
+            "conditions": [
+                {"type": "Succeeded", "status": "Unknown", "reason": "Running", "message": "Running"}
+            ],
+        }
+        if self.args.sign_delay >= 0:
+            obj["metadata"]["finalizers"] = [FINALIZERS[plural]]
+        self._note(plural, key, "started")
+        self._emit("MODIFIED", plural, obj)
+
+        if plural == "pipelineruns":
+            for task_idx in range(self.args.tasks):
+                task = f"task-{task_idx}"
+                tr = self._create(
+                    "taskruns",
+                    key[0],
+                    {
+                        "metadata": {
+                            "name": f"{key[1]}-{task}",
+                            "labels": dict(
+                                obj["metadata"].get("labels", {}),
+                                **{"tekton.dev/pipelineRun": key[1], "tekton.dev/pipelineTask": task},
+                            ),
+                        },
+                        "spec": {"taskRef": {"name": task}},
+                    },
+                )
+                tr_key = (key[0], tr["metadata"]["name"])
+                self._start("taskruns", tr_key)
+                self.objects["taskruns"][tr_key]["status"]["podName"] = f"{tr_key[1]}-pod"
+            duration = self.args.duration * self.rng.uniform(0.5, 1.5)
+            self._schedule(duration, plural, key, "finish")
+
+    def _finish(self, plural, key, succeeded):
+        obj = self.objects[plural][key]
+        now = time.time()
+        obj["status"]["completionTime"] = k8s_time(now)
+        if succeeded:
+            obj["status"]["conditions"] = [
+                {"type": "Succeeded", "status": "True", "reason": "Succeeded", "message": "Tasks Completed"}
+            ]
+        else:
+            obj["status"]["conditions"] = [
+                {"type": "Succeeded", "status": "False", "reason": "Failed", "message": "Tasks Failed"}
+            ]
+        self._note(plural, key, "finished")
+        self._emit("MODIFIED", plural, obj)
+        if self.args.sign_delay >= 0:
+            self._schedule(self.args.sign_delay, plural, key, "sign")
+        if self.args.results_delay >= 0:
+            self._schedule(self.args.results_delay, plural, key, "store")
+        if self.args.prune_delay >= 0 and plural == "pipelineruns":
+            self._schedule(self.args.prune_delay, plural, key, "delete")
+
+        if plural == "pipelineruns":
+            for tr_key in list(self.children.get(key, ())):
+                self._finish("taskruns", tr_key, succeeded)
+
+    def _sign(self, plural, key):
+        obj = self.objects[plural][key]
+        obj["metadata"].setdefault("annotations", {})["chains.tekton.dev/signed"] = "true"
+        obj["metadata"].pop("finalizers", None)
+        self._note(plural, key, "signed")
+        self._emit("MODIFIED", plural, obj)
+
+    def _store(self, plural, key):
+        obj = self.objects[plural][key]
+        result = f"{key[0]}/results/{obj['metadata']['uid']}"
+        obj["metadata"].setdefault("annotations", {}).update(
+            {
+                "results.tekton.dev/result": result,
+                "results.tekton.dev/record": f"{result}/records/{obj['metadata']['uid']}",
+                "results.tekton.dev/log": f"{result}/logs/{obj['metadata']['uid']}",
+                "results.tekton.dev/stored": "true",
+            }
+        )
+        self._note(plural, key, "stored")
+        self._emit("MODIFIED", plural, obj)
+
+    def _delete(self, plural, key):
+        obj = self.objects[plural].pop(key)
+        self._note(plural, key, "deleted")
+        self._emit("DELETED", plural, obj)
+        if plural == "pipelineruns":
+            for tr_key in list(self.children.pop(key, ())):
+                self._delete("taskruns", tr_key)
+        else:
+            pr_name = obj["metadata"].get("labels", {}).get("tekton.dev/pipelineRun")
+            siblings = self.children.get((key[0], pr_name))
+            if siblings is not None:
+                siblings.pop(key, None)
+                if len(siblings) == 0:
+                    del self.children[(key[0], pr_name)]
+
+    def simulate(self, stop_event):
+        steps = {
+            "start": self._start,
+            "finish": lambda plural, key: self._finish(
+                plural, key, self.rng.random() >= self.args.failure_ratio
+            ),
+            "sign": self._sign,
+            "store": self._store,
+            "delete": self._delete,
+        }
+        while not stop_event.wait(0.05):
+            with self.condition:
+                now = time.time()
+                while len(self.schedule) > 0 and self.schedule[0][0] <= now:
+                    _, _, plural, key, step = heapq.heappop(self.schedule)
+                    if key in self.objects[plural]:
+                        steps[step](plural, key)
+
+    def list(self, plural, namespace, selector, limit, continue_token, table=False):
+        """
+        Continue token is just offset into sorted list of matching objects,
+        so it is not consistent snapshot like in real API server. With table
+        return Table with Tekton printer columns instead of objects.
+        """
+        with self.condition:
+            items = [
+                obj
+                for key, obj in sorted(self.objects[plural].items())
+                if (not namespace or key[0] == namespace)
+                and matches_labels(obj["metadata"].get("labels", {}), selector)
+            ]
+            offset = int(continue_token) if continue_token else 0
+            page = items[offset : offset + limit] if limit else items[offset:]
+            metadata = {"resourceVersion": str(self.resource_version)}
+            if limit and offset + limit < len(items):
+                metadata["continue"] = str(offset + limit)
+            if table:
+                return json.dumps(
+                    {
+                        "apiVersion": "meta.k8s.io/v1",
+                        "kind": "Table",
+                        "metadata": metadata,
+                        "columnDefinitions": [{"name": c, "type": "string"} for c in TABLE_COLUMNS],
+                        "rows": [
+                            {
+                                "cells": table_cells(obj),
+                                "object": {"kind": "PartialObjectMetadata", "apiVersion": "meta.k8s.io/v1", "metadata": obj["metadata"]},
+                            }
+                            for obj in page
+                        ],
+                    }
+                ).encode()
+            return json.dumps(
+                {
+                    "apiVersion": "tekton.dev/v1",
+                    "kind": KINDS[plural] + "List",
+                    "metadata": metadata,
+                    "items": page,
+                }
+            ).encode()
+
+    def watch(self, plural, namespace, selector, resource_version, timeout, write):
+        """
+        Send events newer than resource_version (or all current objects as
+        ADDED first when it is not given) until timeout.
+        """
+
+        def newer(last):
+            # Walk history from the end so we only touch new events
+            found = []
+            for event in reversed(self.events):
+                if event[0] <= last:
+                    break
+                if wanted(event):
+                    found.append(event[4])
+            found.reverse()
+            return found
+
+        def wanted(event):
+            return (
+                event[1] == plural
+                and (not namespace or event[2] == namespace)
+                and matches_labels(event[3], selector)
+            )
+
+        deadline = time.time() + timeout
+        with self.condition:
+            if resource_version:
+                last = int(resource_version)
+                if len(self.events) > 0 and self.events[0][0] > last + 1:
+                    status = {
+                        "kind": "Status",
+                        "apiVersion": "v1",
+                        "status": "Failure",
+                        "message": f"too old resource version: {last} ({self.events[0][0]})",
+                        "reason": "Expired",
+                        "code": 410,
+                    }
+                    pending = [json.dumps({"type": "ERROR", "object": status}).encode() + b"\n"]
+                    deadline = 0
+                else:
+                    pending = newer(last)
+            else:
+                pending = [
+                    json.dumps({"type": "ADDED", "object": obj}).encode() + b"\n"
+                    for key, obj in sorted(self.objects[plural].items())
+                    if (not namespace or key[0] == namespace)
+                    and matches_labels(obj["metadata"].get("labels", {}), selector)
+                ]
+            last = self.resource_version
+
+        while True:
+            if len(pending) > 0:
+                write(b"".join(pending))
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            with self.condition:
+                if self.resource_version == last:
+                    self.condition.wait(min(remaining, 1))
+                pending = newer(last)
+                last = self.resource_version
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    # Clients read watch streams chunk by chunk, so we need chunked encoding
+    protocol_version = "HTTP/1.1"
+    cluster = None  # set in main()
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+    def _send_json(self, code, data):
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        url = urllib.parse.urlsplit(self.path)
+        match = PATH_RE.match(url.path)
+        if match is None:
+            self._send_json(404, {"kind": "Status", "code": 404, "message": f"{url.path} not found"})
+            return None
+        query = {k: v[0] for k, v in urllib.parse.parse_qs(url.query).items()}
+        return match, query
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        match, query = route
+        plural, namespace = match["plural"], match["namespace"]
+        selector = query.get("labelSelector")
+
+        if query.get("watch", "").lower() in ("true", "1"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            try:
+                self.cluster.watch(
+                    plural,
+                    namespace,
+                    selector,
+                    query.get("resourceVersion"),
+                    int(query.get("timeoutSeconds", 1800)),
+                    write,
+                )
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            return
+
+        self._send_json(
+            200,
+            self.cluster.list(
+                plural,
+                namespace,
+                selector,
+                int(query.get("limit", 0)),
+                query.get("continue"),
+                table="as=Table" in self.headers.get("Accept", ""),
+            ),
+        )
+
+    def do_POST(self):
+        route = self._route()
+        if route is None:
+            return
+        match, _ = route
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._send_json(201, self.cluster.create(match["plural"], match["namespace"], body))
+
+
+def write_kubeconfig(path, port):
+    config = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "fake", "cluster": {"server": f"http://127.0.0.1:{port}"}}],
+        "users": [{"name": "fake", "user": {"token": "fake"}}],
+        "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake", "namespace": "benchmark"}}],
+        "current-context": "fake",
+    }
+    with open(path, "w") as fd:
+        json.dump(config, fd)  # JSON is valid YAML
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fake Kubernetes API server serving Tekton runs for offline benchmark.py testing",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--port", help="Port to listen on", default=8001, type=int)
+    parser.add_argument("--kubeconfig", help="Where to write kubeconfig pointing to this server", default="fake-kubeconfig.yaml")
+    parser.add_argument("--tasks", help="TaskRuns per PipelineRun", default=3, type=int)
+    parser.add_argument("--pending", help="Seconds PipelineRun stays pending", default=1.0, type=float)
+    parser.add_argument("--duration", help="Average seconds PipelineRun runs", default=10.0, type=float)
+    parser.add_argument("--failure-ratio", help="Ratio of runs that fail", default=0.0, type=float)
+    parser.add_argument("--sign-delay", help="Seconds after completion Chains signs the run, negative to disable", default=2.0, type=float)
+    parser.add_argument("--results-delay", help="Seconds after completion Results stores the run, negative to disable", default=3.0, type=float)
+    parser.add_argument("--prune-delay", help="Seconds after completion pruner deletes the run, negative to disable", default=-1, type=float)
+    parser.add_argument("--preload", help="How many finished PipelineRuns (with TaskRuns) to create on start", default=0, type=int)
+    parser.add_argument("--preload-namespaces", help="How many benchmark namespaces to spread preloaded runs to", default=1, type=int)
+    parser.add_argument("--event-history", help="How many events to remember for watches, older resource versions get 410", default=1_000_000, type=int)
+    parser.add_argument("--transitions-file", help="Where to dump times of all lifecycle transitions on exit", default=None)
+    parser.add_argument("--seed", help="Random seed", default=42, type=int)
+    parser.add_argument("-d", "--debug", action="store_true", help="Show debug output")
+    args = parser.parse_args()
+
+    fmt = "%(asctime)s %(name)s %(levelname)s %(message)s"
+    logging.basicConfig(format=fmt, level=logging.DEBUG if args.debug else logging.INFO)
+
+    cluster = Cluster(args)
+    if args.preload > 0:
+        if args.preload_namespaces == 1:
+            namespaces = ["benchmark"]
+        else:
+            namespaces = [f"benchmark{i}" for i in range(1, args.preload_namespaces + 1)]
+        cluster.preload(args.preload, namespaces)
+
+    Handler.cluster = cluster
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    server.daemon_threads = True
+    write_kubeconfig(args.kubeconfig, server.server_address[1])
+
+    stop_event = threading.Event()
+    simulation = threading.Thread(target=cluster.simulate, args=[stop_event], daemon=True)
+    simulation.start()
+
+    def shutdown(signum, frame):
+        stop_event.set()
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    logging.info(f"Listening on 127.0.0.1:{server.server_address[1]}, kubeconfig in {args.kubeconfig}")
+    server.serve_forever()
+
+    if args.transitions_file is not None:
+        with cluster.condition:
+            with open(args.transitions_file, "w") as fd:
+                json.dump(cluster.transitions, fd)
+        logging.info(f"Transitions dumped to {args.transitions_file}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
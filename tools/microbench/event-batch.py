@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Compare how many watch events per second benchmark.py processes when
+# draining EventsWatcher buffer one by one and in batches (one lock
+# acquisition per batch, events for the same run coalesced), and check
+# tracked runs end up the same.
+
+import argparse
+import importlib.util
+import os.path
+import threading
+import time
+
+
+def load_tool(name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", name)
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def lifecycle(idx):
+    """
+    Return projected watch events one TaskRun goes through.
+    """
+    metadata = {
+        "name": f"run-{idx}-task",
+        "namespace": "benchmark",
+        "creationTimestamp": "2024-01-01T00:00:00Z",
+    }
+    running = {"startTime": "2024-01-01T00:00:01Z", "conditions": [{"type": "Succeeded", "status": "Unknown", "reason": "Running"}]}
+    finished = {
+        "startTime": "2024-01-01T00:00:01Z",
+        "completionTime": "2024-01-01T00:00:10Z",
+        "conditions": [{"type": "Succeeded", "status": "True", "reason": "Succeeded"}],
+    }
+    signed = {"chains.tekton.dev/signed": "true"}
+    stored = dict(signed, **{"results.tekton.dev/result": "r", "results.tekton.dev/record": "r/r", "results.tekton.dev/stored": "true"})
+    return [
+        ("ADDED", dict(metadata), {}),
+        ("MODIFIED", dict(metadata, finalizers=["chains.tekton.dev"]), running),
+        ("MODIFIED", dict(metadata, finalizers=["chains.tekton.dev"]), finished),
+        ("MODIFIED", dict(metadata, annotations=signed), finished),
+        ("MODIFIED", dict(metadata, annotations=stored), finished),
+        ("DELETED", dict(metadata, annotations=stored), finished),
+    ]
+
+
+def make_items(runs, concurrent):
+    """
+    Buffer items (stream, resource version, event) for runs going through
+    their lifecycle concurrent at a time, so events of one run are
+    interleaved with events of others.
+    """
+    items = []
+    received_at = 1_700_000_000.0
+    for first in range(0, runs, concurrent):
+        lifecycles = [lifecycle(idx) for idx in range(first, min(first + concurrent, runs))]
+        for step in range(len(lifecycles[0])):
+            for events in lifecycles:
+                event_type, metadata, status = events[step]
+                received_at += 0.001
+                event = {
+                    "type": event_type,
+                    "object": {"metadata": metadata, "status": status},
+                    "received_at": received_at,
+                }
+                items.append(("", str(len(items)), event))
+    return items
+
+
+def run(benchmark, items, batch_size):
+    class QueueWatcher(benchmark.EventsWatcher):
+        def start(self):
+            for item in items:
+                self._buffer.put(item)
+            self._buffer.put(StopIteration())
+
+    watcher = QueueWatcher(args=None, stop_event=threading.Event())
+    data = {}
+    stats = benchmark.RunsStats()
+    start = time.perf_counter()
+    benchmark.process_events_thread(
+        watcher, data, stats, threading.Lock(), "taskruns", None, batch_size
+    )
+    duration = time.perf_counter() - start
+    print(
+        f"batch size {batch_size}: {len(items) / duration:.0f} events/s ({duration:.2f} s), resource version {watcher.resource_versions['']}"
+    )
+    return {name: record.to_dict() for name, record in data.items()}, stats.get("benchmark")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure watch events processing speed of benchmark.py with and without batching",
+    )
+    parser.add_argument("--runs", help="How many TaskRuns (6 events each)", default=50000, type=int)
+    parser.add_argument("--concurrent", help="How many TaskRuns go through lifecycle at once", default=100, type=int)
+    parser.add_argument("--batch-sizes", help="Comma separated batch sizes to try", default="1,10,100,1000")
+    args = parser.parse_args()
+
+    benchmark = load_tool("benchmark.py")
+    benchmark.kubernetes.config.load_kube_config = lambda: None  # no cluster needed
+
+    baseline = None
+    for batch_size in [int(i) for i in args.batch_sizes.split(",")]:
+        result = run(benchmark, make_items(args.runs, args.concurrent), batch_size)
+        if baseline is None:
+            baseline = result
+        elif result != baseline:
+            print(f"batch size {batch_size}: tracked runs differ from batch size {args.batch_sizes.split(',')[0]}!")
+
+
+if __name__ == "__main__":
+    main()
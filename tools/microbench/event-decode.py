@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Compare how many TaskRun watch events per second we can decode with full
+# deserialization (what kubernetes client watch does) and with our fast
+# path in benchmark.py (raw line decode + projection), and how many of them
+# process_events_thread can then process.
+
+import argparse
+import importlib.util
+import json
+import os.path
+import threading
+import time
+
+
+def load_tool(name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", name)
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_taskrun(idx, steps):
+    """
+    Create TaskRun similar in size to what we see in bigger scenarios.
+    """
+    return {
+        "apiVersion": "tekton.dev/v1",
+        "kind": "TaskRun",
+        "metadata": {
+            "name": f"run-{idx}-task",
+            "namespace": "benchmark",
+            "resourceVersion": str(1000 + idx),
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "finalizers": ["chains.tekton.dev"],
+            "labels": {f"label-{i}": "value" * 5 for i in range(10)},
+            "annotations": {
+                "chains.tekton.dev/signed": "true",
+                "results.tekton.dev/log": f"benchmark/results/{idx}/logs/{idx}",
+                "kubectl.kubernetes.io/last-applied-configuration": "x" * 2000,
+            },
+        },
+        "spec": {
+            "taskSpec": {
+                "steps": [
+                    {"name": f"step-{i}", "image": "ubi9", "script": "echo hello\n" * 20}
+                    for i in range(steps)
+                ]
+            }
+        },
+        "status": {
+            "podName": f"run-{idx}-task-pod",
+            "startTime": "2024-01-01T00:00:01Z",
+            "completionTime": "2024-01-01T00:00:10Z",
+            "conditions": [
+                {
+                    "type": "Succeeded",
+                    "status": "True",
+                    "reason": "Succeeded",
+                    "message": "All Steps have completed executing",
+                }
+            ],
+            "steps": [
+                {
+                    "name": f"step-{i}",
+                    "container": f"step-step-{i}",
+                    "imageID": "ubi9@sha256:" + "0" * 64,
+                    "terminated": {
+                        "exitCode": 0,
+                        "reason": "Completed",
+                        "startedAt": "2024-01-01T00:00:02Z",
+                        "finishedAt": "2024-01-01T00:00:09Z",
+                    },
+                }
+                for i in range(steps)
+            ],
+            "taskSpec": {
+                "steps": [
+                    {"name": f"step-{i}", "image": "ubi9", "script": "echo hello\n" * 20}
+                    for i in range(steps)
+                ]
+            },
+        },
+    }
+
+
+class ListWatcher:
+    def __init__(self, benchmark, events):
+        self.events = events
+        self.position = 0  # first event not returned yet
+        self.metrics = benchmark.WatchMetrics(benchmark.queue.Queue())
+
+    def start(self):
+        pass
+
+    def next_batch(self, max_events):
+        if self.position >= len(self.events):
+            raise StopIteration()
+        batch = self.events[self.position:self.position + max_events]
+        self.position += len(batch)
+        return batch
+
+
+def measure(name, count, func):
+    start = time.perf_counter()
+    result = func()
+    duration = time.perf_counter() - start
+    print(f"{name}: {count / duration:.0f} events/s ({duration:.2f} s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure watch events decoding and processing speed of benchmark.py",
+    )
+    parser.add_argument("--events", help="How many events", default=20000, type=int)
+    parser.add_argument("--steps", help="Steps per TaskRun", default=50, type=int)
+    parser.add_argument("--batch-sizes", help="Comma separated batch sizes to process events with", default="1,1000")
+    args = parser.parse_args()
+
+    benchmark = load_tool("benchmark.py")
+
+    lines = [
+        json.dumps({"type": "MODIFIED", "object": make_taskrun(i, args.steps)})
+        for i in range(args.events)
+    ]
+    print(
+        f"Generated {args.events} events, {sum(len(l) for l in lines) / args.events / 1024:.1f} KiB each, orjson {'available' if benchmark.orjson is not None else 'missing'}"
+    )
+
+    measure("json.loads full objects", args.events, lambda: [json.loads(l) for l in lines])
+    events = measure(
+        "json_loads + project_event",
+        args.events,
+        lambda: [benchmark.project_event(benchmark.json_loads(l)) for l in lines],
+    )
+    received_at = time.time()
+    for event in events:
+        event["received_at"] = received_at
+
+    for batch_size in [int(i) for i in args.batch_sizes.split(",")]:
+        measure(
+            f"process_events_thread, batch size {batch_size}",
+            args.events,
+            lambda: benchmark.process_events_thread(
+                ListWatcher(benchmark, events),
+                {},
+                benchmark.RunsStats(),
+                threading.Lock(),
+                "taskruns",
+                None,
+                batch_size,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
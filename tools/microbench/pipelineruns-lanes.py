@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Measure how long show-pipelineruns.py takes to assign synthetic
+# PipelineRuns and their TaskRuns to graph lanes, and check the layout is
+# the same as first fit lane assignment we used before.
+
+import argparse
+import datetime
+import importlib.util
+import os.path
+import random
+import sys
+import time
+
+
+def load_tool(name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", name)
+    module_name = name.replace("-", "_")[:-3]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module  # so loader processes can unpickle
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_data(runs, concurrent, tasks):
+    """
+    Data as Something has them after loading: PipelineRuns created about
+    concurrent at a time, each with given number of partially overlapping
+    TaskRuns.
+    """
+    random.seed(runs)
+    base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    data = {}
+    for idx in range(runs):
+        created = base + datetime.timedelta(seconds=idx * 60 / concurrent + random.random() * 10)
+        pr = {
+            "creationTimestamp": created,
+            "start_time": created + datetime.timedelta(seconds=1),
+            "taskRuns": {},
+        }
+        end = created
+        for task in range(tasks):
+            tr_created = created + datetime.timedelta(seconds=task * 10 + random.random() * 5)
+            tr_end = tr_created + datetime.timedelta(seconds=5 + random.random() * 20)
+            pr["taskRuns"][f"task-{task}"] = {
+                "creationTimestamp": tr_created,
+                "start_time": tr_created + datetime.timedelta(seconds=1),
+                "completionTime": tr_end,
+            }
+            end = max(end, tr_end)
+        pr["completionTime"] = end + datetime.timedelta(seconds=1)
+        data[f"run-{idx}"] = pr
+    return data
+
+
+def first_fit(entities):
+    """
+    Previous lane assignment: quadratic first fit, fed with entities sorted
+    by start.
+    """
+    start = "creationTimestamp"
+    end = "completionTime"
+    lanes = []
+    for entity in sorted(entities, key=lambda e: e[start]):
+        for lane in lanes:
+            if not any(
+                m[start] <= entity[start] <= m[end]
+                or m[start] <= entity[end] <= m[end]
+                or entity[start] <= m[start] <= entity[end]
+                for m in lane
+            ):
+                lane.append(entity)
+                break
+        else:
+            lanes.append([entity])
+    return lanes
+
+
+def layout(pr_lanes):
+    return [
+        [(pr["name"], [[tr["name"] for tr in lane] for lane in pr["tr_lanes"]]) for pr in pr_lane]
+        for pr_lane in pr_lanes
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure lane assignment speed of show-pipelineruns.py",
+    )
+    parser.add_argument("--runs", help="Comma separated numbers of PipelineRuns to try", default="1000,10000,100000")
+    parser.add_argument("--concurrent", help="How many PipelineRuns are created per minute", default=100, type=int)
+    parser.add_argument("--tasks", help="How many TaskRuns per PipelineRun", default=5, type=int)
+    parser.add_argument("--check-limit", help="Compare with first fit up to this many PipelineRuns (it is quadratic)", default=2000, type=int)
+    args = parser.parse_args()
+
+    tool = load_tool("show-pipelineruns.py")
+
+    for runs in [int(i) for i in args.runs.split(",")]:
+        something = tool.Something.__new__(tool.Something)
+        something.data = make_data(runs, args.concurrent, args.tasks)
+        something.pr_lanes = []
+
+        start = time.perf_counter()
+        something._compute_lanes()
+        duration = time.perf_counter() - start
+        print(f"{runs} PipelineRuns: {duration:.2f} s, {len(something.pr_lanes)} lanes")
+
+        if runs <= args.check_limit:
+            prs = []
+            for name, pr in something.data.items():
+                trs = [dict(tr, name=tr_name) for tr_name, tr in pr["taskRuns"].items()]
+                prs.append(dict(pr, name=name, tr_lanes=first_fit(trs)))
+            if layout(first_fit(prs)) != layout(something.pr_lanes):
+                print(f"{runs} PipelineRuns: layout differs from first fit!")
+
+
+if __name__ == "__main__":
+    main()
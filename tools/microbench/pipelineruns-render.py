@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Measure how long show-pipelineruns.py takes to render graph of synthetic
+# PipelineRuns and how big the output is, in given formats.
+
+import argparse
+import importlib.util
+import os.path
+import sys
+import tempfile
+import time
+
+
+def load_tool(path):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", path)
+    module_name = os.path.basename(path).replace("-", "_")[:-3]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module  # so loader processes can unpickle
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure graph rendering speed of show-pipelineruns.py",
+    )
+    parser.add_argument("--runs", help="Comma separated numbers of PipelineRuns to try", default="1000,10000,100000")
+    parser.add_argument("--concurrent", help="How many PipelineRuns are created per minute", default=100, type=int)
+    parser.add_argument("--tasks", help="How many TaskRuns per PipelineRun", default=5, type=int)
+    parser.add_argument("--formats", help="Comma separated output formats to try", default="auto")
+    parser.add_argument("--max-labels", help="Label limit passed to show-pipelineruns.py", default=1000, type=int)
+    args = parser.parse_args()
+
+    tool = load_tool("show-pipelineruns.py")
+    lanes = load_tool(os.path.join("microbench", "pipelineruns-lanes.py"))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for runs in [int(i) for i in args.runs.split(",")]:
+            something = tool.Something.__new__(tool.Something)
+            something.data = lanes.make_data(runs, args.concurrent, args.tasks)
+            something.data_dir = data_dir
+            something.pr_lanes = []
+            something.pr_count = runs
+            something.max_labels = args.max_labels
+            something._compute_lanes()
+
+            for fig_format in args.formats.split(","):
+                something.fig_format = fig_format
+                start = time.perf_counter()
+                something._plot_graph()
+                duration = time.perf_counter() - start
+                for output in os.listdir(data_dir):
+                    size = os.path.getsize(os.path.join(data_dir, output))
+                    print(f"{runs} PipelineRuns, {fig_format} format: {duration:.2f} s, {output} has {size / 1024 / 1024:.1f} MB")
+                    os.remove(os.path.join(data_dir, output))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 
 import argparse
+import bisect
 import collections
-import copy
+import concurrent.futures
+import csv
 import datetime
+import heapq
 import json
 import logging
 import os
@@ -13,11 +16,16 @@ import sys
 import yaml
 import time
 
-import matplotlib.pyplot
-import matplotlib.colors
-
+import numpy
 import tabulate
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def str2date(date_str):
     if isinstance(date_str, datetime.datetime):
@@ -33,33 +41,441 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-class DateTimeDecoder(json.JSONDecoder):
-    def __init__(self, *args, **kwargs):
-        super().__init__(object_hook=self.object_hook, *args, **kwargs)
+def is_data_file(path):
+    return path.endswith(".yaml") or path.endswith(".yml") or path.endswith(".json")
+
+
+# Fields of items we need, extracted in loader processes
+PipelineRunFields = collections.namedtuple(
+    "PipelineRunFields",
+    ["name", "condition", "creationTimestamp", "completionTime", "startTime"],
+)
+TaskRunFields = collections.namedtuple(
+    "TaskRunFields",
+    [
+        "name",
+        "task",
+        "pipelinerun",
+        "condition",
+        "statusMessage",
+        "creationTimestamp",
+        "completionTime",
+        "startTime",
+        "podName",
+        "namespace",
+    ],
+)
+PodFields = collections.namedtuple(
+    "PodFields", ["name", "pipelinerun", "task", "node_name"]
+)
+
+MESSAGE_NAMES = {
+    "PipelineRun": re.compile(r'PipelineRun "[a-z0-9-]+"'),
+    "TaskRun": re.compile(r'TaskRun "[a-z0-9-]+"'),
+}
+
+
+def dig(item, *keys):
+    """
+    Return item[key1][key2]... or None if some of the keys is missing.
+    """
+    try:
+        for key in keys:
+            item = item[key]
+    except (KeyError, TypeError):
+        return None
+    return item
+
+
+def succeeded_condition(item):
+    """
+    Return None if item has no conditions, empty tuple if none of them is
+    Succeeded, otherwise status and message (with run name replaced) of the
+    Succeeded condition.
+    """
+    conditions = dig(item, "status", "conditions")
+    if conditions is None:
+        return None
+    for c in conditions:
+        if c["type"] == "Succeeded":
+            kind = item["kind"]
+            message = MESSAGE_NAMES[kind].sub(f'{kind} "REPLACED"', c["message"])
+            return (c["status"], message)
+    return ()
+
+
+def extract_pipelinerun(pr):
+    return PipelineRunFields(
+        name=dig(pr, "metadata", "name"),
+        condition=succeeded_condition(pr),
+        creationTimestamp=dig(pr, "metadata", "creationTimestamp"),
+        completionTime=dig(pr, "status", "completionTime"),
+        startTime=dig(pr, "status", "startTime"),
+    )
 
-    def object_hook(self, o):
-        ret = {}
-        for key, value in o.items():
-            if isinstance(value, str):
-                try:
-                    ret[key] = datetime.datetime.fromisoformat(value)
-                except ValueError:
-                    ret[key] = value
+
+def extract_taskrun(tr):
+    return TaskRunFields(
+        name=dig(tr, "metadata", "name"),
+        task=dig(tr, "metadata", "labels", "tekton.dev/pipelineTask"),
+        pipelinerun=dig(tr, "metadata", "labels", "tekton.dev/pipelineRun"),
+        condition=succeeded_condition(tr),
+        statusMessage=dig(tr, "spec", "statusMessage"),
+        creationTimestamp=dig(tr, "metadata", "creationTimestamp"),
+        completionTime=dig(tr, "status", "completionTime"),
+        startTime=dig(tr, "status", "startTime"),
+        podName=dig(tr, "status", "podName"),
+        namespace=dig(tr, "metadata", "namespace"),
+    )
+
+
+def extract_pod(pod):
+    return PodFields(
+        name=dig(pod, "metadata", "name"),
+        pipelinerun=dig(pod, "metadata", "labels", "tekton.dev/pipelineRun"),
+        task=dig(pod, "metadata", "labels", "tekton.dev/pipelineTask"),
+        node_name=dig(pod, "spec", "nodeName"),
+    )
+
+
+EXTRACTORS = {
+    "PipelineRun": extract_pipelinerun,
+    "TaskRun": extract_taskrun,
+    "Pod": extract_pod,
+}
+
+
+def extract_item(item):
+    """
+    Return item kind and its fields we need (None for unexpected kinds).
+    Only these small tuples are sent back from loader processes.
+    """
+    kind = item.get("kind")
+    return kind, EXTRACTORS[kind](item) if kind in EXTRACTORS else None
+
+
+def parse_file(path):
+    """
+    Parse Kubernetes List from YAML or JSON file. Return kind of the
+    document and its items passed through extract_item (None if there are
+    no items).
+    """
+    if path.endswith(".json") and ijson is not None:
+        # Parse items one by one so the whole document is never in memory.
+        # Look at top level keys up to "items" first. Kubernetes lists
+        # have "kind" after "items", then we need one more pass for it.
+        kind = None
+        has_items = False
+        with open(path, "rb") as fd:
+            for prefix, event, value in ijson.parse(fd):
+                if prefix == "kind" and event == "string":
+                    kind = value
+                elif prefix == "" and event == "map_key" and value == "items":
+                    has_items = True
+                    break
+        if has_items and kind is None:
+            with open(path, "rb") as fd:
+                kind = next(ijson.items(fd, "kind"), None)
+        if kind != "List" or not has_items:
+            return kind, None
+        with open(path, "rb") as fd:
+            items = [extract_item(i) for i in ijson.items(fd, "items.item", use_float=True)]
+        return kind, items
+    with open(path, "r") as fd:
+        if path.endswith(".json"):
+            data = json.load(fd)
+        else:
+            data = yaml.load(fd, Loader=YAML_LOADER)
+    if not isinstance(data, dict):
+        return None, None
+    items = [extract_item(i) for i in data["items"]] if "items" in data else None
+    return data.get("kind"), items
+
+
+# Bump when extracted fields change to invalidate old caches
+CACHE_VERSION = 1
+CACHE_DIR = ".show-pipelineruns-cache"
+FIELDS = {
+    "PipelineRun": PipelineRunFields,
+    "TaskRun": TaskRunFields,
+    "Pod": PodFields,
+}
+TIMESTAMP_FIELDS = ("creationTimestamp", "completionTime", "startTime")
+
+
+def cache_path(path):
+    return os.path.join(
+        os.path.dirname(path), CACHE_DIR, os.path.basename(path) + ".npz"
+    )
+
+
+def cache_key(path):
+    """
+    Cache is valid for the same file path, size and modification time.
+    """
+    stat = os.stat(path)
+    return numpy.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=numpy.int64)
+
+
+def intern_strings(values):
+    """
+    Return table of unique strings and array of indexes into it (-1 for
+    None).
+    """
+    table = {}
+    codes = [-1 if v is None else table.setdefault(v, len(table)) for v in values]
+    return numpy.array(list(table), dtype=str), numpy.array(codes, dtype=numpy.int32)
+
+
+def lookup_strings(table, codes):
+    table = table.tolist()
+    return [None if c == -1 else table[c] for c in codes.tolist()]
+
+
+def save_cache(path, kind, items):
+    """
+    Store extracted items in columnar NumPy .npz next to the data file:
+    timestamps as epoch seconds, strings interned and conditions split to
+    state (0 no conditions, 1 no Succeeded one, 2 present), status and
+    message.
+    """
+    arrays = {
+        "key": cache_key(path),
+        "source": numpy.array([os.path.abspath(path)]),
+        "kind": numpy.array(["" if kind is None else kind]),
+        "has_items": numpy.array([items is not None]),
+    }
+    items = items if items is not None else []
+    arrays["item_kinds"], arrays["item_kind_codes"] = intern_strings([i[0] for i in items])
+    for kind_name, fields_type in FIELDS.items():
+        rows = [fields for item_kind, fields in items if item_kind == kind_name]
+        for field in fields_type._fields:
+            prefix = f"{kind_name}.{field}"
+            values = [getattr(row, field) for row in rows]
+            if field in TIMESTAMP_FIELDS:
+                arrays[prefix] = numpy.array(
+                    [numpy.nan if v is None else str2date(v).timestamp() for v in values]
+                )
+            elif field == "condition":
+                arrays[prefix + ".state"] = numpy.array(
+                    [0 if v is None else 1 if v == () else 2 for v in values],
+                    dtype=numpy.int8,
+                )
+                arrays[prefix + ".status"], arrays[prefix + ".status_codes"] = intern_strings(
+                    [v[0] if v else None for v in values]
+                )
+                arrays[prefix + ".message"], arrays[prefix + ".message_codes"] = intern_strings(
+                    [v[1] if v else None for v in values]
+                )
             else:
-                ret[key] = value
-        return ret
+                arrays[prefix], arrays[prefix + "_codes"] = intern_strings(values)
+
+    target = cache_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target + ".tmp", "wb") as fd:
+        numpy.savez(fd, **arrays)
+    os.replace(target + ".tmp", target)
+
+
+def load_cache(path, kinds):
+    """
+    Return kind and items of the data file from its cache or None if there
+    is no valid cache. Only fields of items of given kinds are decoded.
+    """
+    try:
+        cached = numpy.load(cache_path(path))
+    except (OSError, ValueError):
+        return None
+    with cached:
+        if (
+            not numpy.array_equal(cached["key"], cache_key(path))
+            or cached["source"][0] != os.path.abspath(path)
+        ):
+            return None
+        kind = cached["kind"][0] or None
+        if not cached["has_items"][0]:
+            return kind, None
+
+        rows = {}
+        for kind_name, fields_type in FIELDS.items():
+            if kind_name not in kinds:
+                continue
+            columns = []
+            for field in fields_type._fields:
+                prefix = f"{kind_name}.{field}"
+                if field in TIMESTAMP_FIELDS:
+                    columns.append(
+                        [
+                            None if numpy.isnan(v) else datetime.datetime.fromtimestamp(v, datetime.timezone.utc)
+                            for v in cached[prefix].tolist()
+                        ]
+                    )
+                elif field == "condition":
+                    statuses = lookup_strings(cached[prefix + ".status"], cached[prefix + ".status_codes"])
+                    messages = lookup_strings(cached[prefix + ".message"], cached[prefix + ".message_codes"])
+                    columns.append(
+                        [
+                            None if state == 0 else () if state == 1 else (status, message)
+                            for state, status, message in zip(cached[prefix + ".state"].tolist(), statuses, messages)
+                        ]
+                    )
+                else:
+                    columns.append(lookup_strings(cached[prefix], cached[prefix + "_codes"]))
+            rows[kind_name] = iter([fields_type(*row) for row in zip(*columns)])
+
+        items = []
+        for item_kind in lookup_strings(cached["item_kinds"], cached["item_kind_codes"]):
+            items.append((item_kind, next(rows[item_kind]) if item_kind in rows else None))
+        return kind, items
+
+
+def load_file(path, use_cache=True, kinds=tuple(FIELDS)):
+    """
+    Load data file in a loader process, from cache if it is valid (then
+    items of kinds we do not need have no fields). Return how long it
+    took, whether cache was used and what parse_file returns.
+    """
+    start = time.time()
+    if use_cache:
+        cached = load_cache(path, kinds)
+        if cached is not None:
+            return (time.time() - start, True) + cached
+    kind, items = parse_file(path)
+    if use_cache:
+        try:
+            save_cache(path, kind, items)
+        except OSError as e:
+            logging.warning(f"Failed to save cache for {path}: {e}")
+    return time.time() - start, False, kind, items
+
+
+def assign_lanes(entities):
+    """
+    Put entities into lanes so members of one lane do not overlap.
+
+    Entities are taken by start time and each goes to the lowest lane that
+    is free by then (interval partitioning with heaps of lane end times and
+    free lanes), which is the same as first fit on sorted input, but
+    O(n log n).
+    """
+    start = "creationTimestamp"
+    end = "completionTime"
+    lanes = []
+    busy = []  # (end of last member, lane index)
+    free = []  # indexes of lanes free at current start time
+    for entity in sorted(entities, key=lambda e: e[start]):
+        while busy and busy[0][0] < entity[start]:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            idx = heapq.heappop(free)
+        else:
+            idx = len(lanes)
+            lanes.append([])
+        lanes[idx].append(entity)
+        heapq.heappush(busy, (entity[end], idx))
+    return lanes
+
+
+def union_lengths(groups, starts, ends, count):
+    """
+    Return length of union of intervals for every group (e.g. TaskRuns of
+    one PipelineRun) at once, in O(k log k).
+
+    Intervals are sorted by group and start, and each one adds only the
+    part after the furthest end of preceding intervals in its group.
+    """
+    if groups.size == 0:
+        return numpy.zeros(count)
+    order = numpy.lexsort((starts, groups))
+    origin = starts.min()  # keep numbers small
+    groups, starts, ends = groups[order], starts[order] - origin, ends[order] - origin
+    # Shift groups apart so running maximum does not leak between them
+    offset = groups * (ends.max() + 1)
+    furthest = numpy.maximum.accumulate(ends + offset) - offset
+    previous = numpy.empty_like(furthest)
+    previous[1:] = furthest[:-1]
+    previous[numpy.r_[True, groups[1:] != groups[:-1]]] = -numpy.inf
+    added = numpy.maximum(0, ends - numpy.maximum(starts, previous))
+    return numpy.bincount(groups, weights=added, minlength=count)
+
+
+def longest_chain(intervals):
+    """
+    Return longest total duration of intervals running one after another
+    (weighted interval scheduling: DP over intervals sorted by end, bisect
+    to find the last one which ended before current one started).
+    """
+    intervals = sorted(intervals, key=lambda i: i[1])
+    ends = [i[1] for i in intervals]
+    best = [0.0]  # best[n] is longest chain from the first n intervals
+    for start, end in intervals:
+        compatible = bisect.bisect_right(ends, start, 0, len(best) - 1)
+        best.append(max(best[-1], best[compatible] + end - start))
+    return best[-1]
+
+
+def rectangles(boxes, **kwargs):
+    """
+    Return one PolyCollection with all given (x, width, y, height) boxes,
+    which is much cheaper to draw than one broken_barh per box.
+    """
+    import matplotlib.collections
+
+    boxes = numpy.array(boxes, dtype=float).reshape(-1, 4)
+    x0 = boxes[:, 0]
+    x1 = boxes[:, 0] + boxes[:, 1]
+    y0 = boxes[:, 2]
+    y1 = boxes[:, 2] + boxes[:, 3]
+    verts = numpy.stack(
+        [
+            numpy.stack([x0, y0], axis=1),
+            numpy.stack([x0, y1], axis=1),
+            numpy.stack([x1, y1], axis=1),
+            numpy.stack([x1, y0], axis=1),
+        ],
+        axis=1,
+    )
+    return matplotlib.collections.PolyCollection(verts, **kwargs)
+
+
+def describe(values):
+    """
+    Return average, median, 95th percentile and maximum of values.
+    """
+    if len(values) == 0:
+        return None, None, None, None
+    values = numpy.asarray(values)
+    return (
+        values.mean().item(),
+        numpy.percentile(values, 50).item(),
+        numpy.percentile(values, 95).item(),
+        values.max().item(),
+    )
 
 
 class Something:
-    def __init__(self, data_dir):
+    def __init__(
+        self,
+        data_dir,
+        workers=None,
+        fig_format="auto",
+        max_labels=1000,
+        use_cache=True,
+        kinds=tuple(FIELDS),
+    ):
         self.data = {}
         self.data_taskruns = []
         self.data_pods = []
         self.data_taskruns = []
         self.data_dir = data_dir
+        self.workers = workers
+        self.use_cache = use_cache
+        self.kinds = kinds  # kinds of items we need for selected stages
         self.pr_lanes = []
 
-        self.fig_path = os.path.join(self.data_dir, "output.svg")
+        self.fig_format = fig_format
+        self.max_labels = max_labels  # more PipelineRuns or TaskRuns are not labeled
+        self.node_columns = None  # computed by _get_node_columns
 
         self.pr_count = 0
         self.tr_count = 0
@@ -77,8 +493,10 @@ class Something:
         self.tr_statuses = collections.defaultdict(lambda: 0)
 
         self._populate(self.data_dir)
-        self._merge_taskruns()
-        self._merge_pods()
+        if "TaskRun" in self.kinds:
+            self._merge_taskruns()
+        if "Pod" in self.kinds:
+            self._merge_pods()
 
     def _merge_taskruns(self):
         for tr in self.data_taskruns:
@@ -140,201 +558,188 @@ class Something:
         self.data_pods = []
 
     def _populate(self, data_dir):
+        """
+        Files are parsed (or loaded from cache) in a pool of processes,
+        here we only go through fields extracted from their items.
+        """
+        datafiles = []
         for currentpath, folders, files in os.walk(data_dir):
+            if CACHE_DIR in folders:
+                folders.remove(CACHE_DIR)
             for datafile in files:
                 datafile = os.path.join(currentpath, datafile)
+                if is_data_file(datafile):
+                    datafiles.append(datafile)
+
+        start = time.time()
+        total_size = 0
+        workers = self.workers if self.workers is not None else os.cpu_count()
+        if workers > 1 and len(datafiles) > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        else:
+            # Not worth pickling results from other process
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        with executor:
+            for datafile, (duration, cached, kind, items) in zip(
+                datafiles,
+                executor.map(
+                    load_file,
+                    datafiles,
+                    [self.use_cache] * len(datafiles),
+                    [self.kinds] * len(datafiles),
+                ),
+            ):
+                size = os.path.getsize(datafile)
+                total_size += size
+                print(
+                    f"Loaded {datafile}{' from cache' if cached else ''} in {duration:.2f} seconds ({size / 1024 / 1024 / max(duration, 1e-6):.1f} MB/s)"
+                )
 
-                start = time.time()
-                if datafile.endswith(".yaml") or datafile.endswith(".yml"):
-                    with open(datafile, "r") as fd:
-                        data = yaml.safe_load(fd)
-                elif datafile.endswith(".json"):
-                    data = self._load_json(datafile)
-                else:
-                    continue
-                end = time.time()
-                print(f"Loaded {datafile} in {(end - start):.2f} seconds")
-
-                if "kind" not in data or data["kind"] != "List":
+                if kind != "List":
                     logging.info(f"Skipping {datafile} as it is not a list")
                     continue
 
-                if "items" not in data:
+                if items is None:
                     logging.info(f"Skipping {datafile} as it does not contain items")
                     continue
 
-                for i in data["items"]:
-                    if "kind" not in i:
+                for kind, fields in items:
+                    if kind is None:
                         logging.info("Skipping item because it does not have kind")
                         continue
 
-                    if i["kind"] == "PipelineRun":
-                        self._populate_pipelinerun(i)
-                    elif i["kind"] == "TaskRun":
-                        self._populate_taskrun(i)
-                    elif i["kind"] == "Pod":
-                        self._populate_pod(i)
+                    if kind in FIELDS and kind not in self.kinds:
+                        continue
+
+                    if kind == "PipelineRun":
+                        self._populate_pipelinerun(fields)
+                    elif kind == "TaskRun":
+                        self._populate_taskrun(fields)
+                    elif kind == "Pod":
+                        self._populate_pod(fields)
                     else:
                         logging.info("Skipping item because it has unexpeted kind")
                         continue
 
+        duration = time.time() - start
+        print(
+            f"Loaded {len(datafiles)} files with {total_size / 1024 / 1024:.1f} MB in {duration:.2f} seconds ({total_size / 1024 / 1024 / max(duration, 1e-6):.1f} MB/s)"
+        )
+
     def _populate_pipelinerun(self, pr):
-        """Load PipelineRun."""
-        try:
-            pr_name = pr["metadata"]["name"]
-        except KeyError as e:
-            logging.info(
-                f"PipelineRun '{str(pr)[:200]}...' missing name, skipping: {e}"
-            )
+        """Load PipelineRun from PipelineRunFields."""
+        if pr.name is None:
+            logging.info("PipelineRun missing name, skipping")
             self.pr_skips += 1
             return
 
-        try:
-            pr_conditions = pr["status"]["conditions"]
-        except KeyError as e:
-            logging.info(f"PipelineRun {pr_name} missing conditions, skipping: {e}")
+        if pr.condition is None:
+            logging.info(f"PipelineRun {pr.name} missing conditions, skipping")
             self.pr_conditions["Missing conditions"] += 1
             self.pr_skips += 1
             return
 
-        pr_condition_ok = False
-        for c in pr_conditions:
-            if c["type"] == "Succeeded":
-                message = re.sub(
-                    r'PipelineRun "[a-z0-9-]+"', 'PipelineRun "REPLACED"', c["message"]
-                )
-                self.pr_conditions[message] += 1
-
-                if c["status"] == "True":
-                    pr_condition_ok = True
-                break
-        else:
+        if pr.condition == ():
             self.pr_conditions["Missing type"] += 1
-        if not pr_condition_ok:
+        else:
+            self.pr_conditions[pr.condition[1]] += 1
+        if pr.condition == () or pr.condition[0] != "True":
             logging.info(
-                f"PipelineRun {pr_name} is not in right condition, skipping: {pr_conditions}"
+                f"PipelineRun {pr.name} is not in right condition, skipping: {pr.condition}"
             )
             self.pr_skips += 1
             return
 
-        try:
-            pr_creationTimestamp = str2date(pr["metadata"]["creationTimestamp"])
-            pr_completionTime = str2date(pr["status"]["completionTime"])
-            pr_startTime = str2date(pr["status"]["startTime"])
-        except KeyError as e:
-            logging.info(f"PipelineRun {pr_name} missing some fields, skipping: {e}")
+        if None in (pr.creationTimestamp, pr.completionTime, pr.startTime):
+            logging.info(f"PipelineRun {pr.name} missing some fields, skipping: {pr}")
             self.pr_skips += 1
             return
 
-        self.data[pr_name] = {
-            "creationTimestamp": pr_creationTimestamp,
-            "completionTime": pr_completionTime,
-            "start_time": pr_startTime,
+        self.data[pr.name] = {
+            "creationTimestamp": str2date(pr.creationTimestamp),
+            "completionTime": str2date(pr.completionTime),
+            "start_time": str2date(pr.startTime),
         }
 
     def _populate_taskrun(self, tr):
-        """Load TaskRun."""
-        try:
-            tr_name = tr["metadata"]["name"]
-        except KeyError as e:
-            logging.info(f"TaskRun missing name, skipping: {e}, {str(tr)[:200]}")
+        """Load TaskRun from TaskRunFields."""
+        if tr.name is None:
+            logging.info("TaskRun missing name, skipping")
             self.tr_skips += 1
             return
 
-        try:
-            tr_task = tr["metadata"]["labels"]["tekton.dev/pipelineTask"]
-            tr_pipelinerun = tr["metadata"]["labels"]["tekton.dev/pipelineRun"]
-        except KeyError as e:
-            logging.info(
-                f"TaskRun {tr_name} missing task or pipelinerun, skipping: {e}"
-            )
+        if tr.task is None or tr.pipelinerun is None:
+            logging.info(f"TaskRun {tr.name} missing task or pipelinerun, skipping")
             self.tr_skips += 1
             return
 
-        try:
-            tr_conditions = tr["status"]["conditions"]
-        except KeyError as e:
-            logging.info(f"TaskRun {tr_name} missing conditions, skipping: {e}")
+        if tr.condition is None:
+            logging.info(f"TaskRun {tr.name} missing conditions, skipping")
             self.tr_conditions["Missing conditions"] += 1
             self.tr_skips += 1
             return
 
-        tr_condition_ok = False
-        for c in tr_conditions:
-            if c["type"] == "Succeeded":
-                message = re.sub(
-                    r'TaskRun "[a-z0-9-]+"', 'TaskRun "REPLACED"', c["message"]
-                )
-                self.tr_conditions[message] += 1
-                if c["status"] == "True":
-                    tr_condition_ok = True
-                break
-        else:
+        if tr.condition == ():
             self.tr_conditions["Missing type"] += 1
-        if not tr_condition_ok:
-            logging.info(f"TaskRun {tr_name} is not in right condition, skipping")
+        else:
+            self.tr_conditions[tr.condition[1]] += 1
+        if tr.condition == () or tr.condition[0] != "True":
+            logging.info(f"TaskRun {tr.name} is not in right condition, skipping")
             self.tr_skips += 1
             return
 
-        try:
-            self.tr_statuses[tr["spec"]["statusMessage"]] += 1
-        except KeyError as e:
+        if tr.statusMessage is None:
             self.tr_statuses["Missing spec.statusMessage"] += 1
-
-        try:
-            tr_creationTimestamp = str2date(tr["metadata"]["creationTimestamp"])
-            tr_completionTime = str2date(tr["status"]["completionTime"])
-            tr_startTime = str2date(tr["status"]["startTime"])
-            tr_podName = tr["status"]["podName"]
-            tr_namespace = tr["metadata"]["namespace"]
-        except KeyError as e:
-            logging.info(f"TaskRun {tr_name} missing some fields, skipping: {e}")
+        else:
+            self.tr_statuses[tr.statusMessage] += 1
+
+        if None in (
+            tr.creationTimestamp,
+            tr.completionTime,
+            tr.startTime,
+            tr.podName,
+            tr.namespace,
+        ):
+            logging.info(f"TaskRun {tr.name} missing some fields, skipping: {tr}")
             self.tr_skips += 1
             return
 
         self.data_taskruns.append(
             {
-                "name": tr_name,
-                "task": tr_task,
-                "pipelinerun": tr_pipelinerun,
-                "creationTimestamp": tr_creationTimestamp,
-                "completionTime": tr_completionTime,
-                "start_time": tr_startTime,
-                "podName": tr_podName,
-                "namespace": tr_namespace,
+                "name": tr.name,
+                "task": tr.task,
+                "pipelinerun": tr.pipelinerun,
+                "creationTimestamp": str2date(tr.creationTimestamp),
+                "completionTime": str2date(tr.completionTime),
+                "start_time": str2date(tr.startTime),
+                "podName": tr.podName,
+                "namespace": tr.namespace,
             }
         )
 
     def _populate_pod(self, pod):
-        """Load Pod."""
-        try:
-            pod_name = pod["metadata"]["name"]
-        except KeyError as e:
-            logging.info(f"Pod missing name, skipping: {e}, {str(pod)[:200]}")
+        """Load Pod from PodFields."""
+        if pod.name is None:
+            logging.info("Pod missing name, skipping")
             self.pod_skips += 1
             return
 
-        try:
-            pod_pipelinerun = pod["metadata"]["labels"]["tekton.dev/pipelineRun"]
-            pod_task = pod["metadata"]["labels"]["tekton.dev/pipelineTask"]
-        except KeyError as e:
-            logging.info(f"Pod {pod_name} missing pipelinerun or task, skipping: {e}")
+        if pod.pipelinerun is None or pod.task is None:
+            logging.info(f"Pod {pod.name} missing pipelinerun or task, skipping")
             self.pod_skips += 1
             return
 
-        try:
-            pod_node_name = pod["spec"]["nodeName"]
-        except KeyError as e:
-            logging.info(f"Pod {pod_name} missing node name filed, skipping: {e}")
+        if pod.node_name is None:
+            logging.info(f"Pod {pod.name} missing node name filed, skipping")
             self.pod_skips += 1
             return
 
         self.data_pods.append(
             {
-                "name": pod_name,
-                "pipelinerun": pod_pipelinerun,
-                "task": pod_task,
-                "node_name": pod_node_name,
+                "name": pod.name,
+                "pipelinerun": pod.pipelinerun,
+                "task": pod.task,
+                "node_name": pod.node_name,
             }
         )
 
@@ -342,10 +747,6 @@ class Something:
         with open(path, "w") as fp:
             json.dump(data, fp, cls=DateTimeEncoder, sort_keys=True, indent=4)
 
-    def _load_json(self, path):
-        with open(path, "r") as fp:
-            return json.load(fp, cls=DateTimeDecoder)
-
     def _compute_lanes(self):
         """
         Based on loaded PipelineRun and TaskRun data, compute lanes for a graph.
@@ -353,58 +754,19 @@ class Something:
         Visualizing overlapping intervals:
         https://www.nxn.se/valent/visualizing-overlapping-intervals
         """
-
-        def fits_into_lane(entity, lane):
-            start = "creationTimestamp"
-            end = "completionTime"
-            logging.debug(
-                f"Checking if entity ({entity[start]} - {entity[end]}) fits into lane with {len(lane)} members"
-            )
-            for member in lane:
-                if (
-                    member[start] <= entity[start] <= member[end]
-                    or member[start] <= entity[end] <= member[end]
-                    or entity[start] <= member[start] <= entity[end]
-                ):
-                    logging.debug(
-                        f"Entity ({entity[start]} - {entity[end]}) does not fit because of lane member ({member[start]} - {member[end]})"
-                    )
-                    return False
-            logging.debug(f"Entity ({entity[start]} - {entity[end]}) fits")
-            return True
-
+        prs = []
         for pr_name, pr_times in self.data.items():
-            pr = copy.deepcopy(pr_times)
+            # Shallow copies only, we do not modify times
+            trs = [
+                dict(tr_times, name=tr_name)
+                for tr_name, tr_times in pr_times["taskRuns"].items()
+            ]
+            pr = {k: v for k, v in pr_times.items() if k != "taskRuns"}
             pr["name"] = pr_name
+            pr["tr_lanes"] = assign_lanes(trs)
+            prs.append(pr)
 
-            # How do we organize it's TRs?
-            tr_lanes = []
-
-            for tr_name, tr_times in pr["taskRuns"].items():
-                tr = copy.deepcopy(tr_times)
-                tr["name"] = tr_name
-                for lane in tr_lanes:
-                    # Is there a lane without colnflict?
-                    if fits_into_lane(tr, lane):
-                        lane.append(tr)
-                        break
-                else:
-                    # Adding new lane
-                    tr_lanes.append([tr])
-
-            pr["tr_lanes"] = tr_lanes
-            del pr["taskRuns"]
-
-            # Where it fits in a list of PRs?
-            for lane in self.pr_lanes:
-                # Is there a lane without colnflict?
-                if fits_into_lane(pr, lane):
-                    lane.append(pr)
-                    break
-            else:
-                # Adding new lane
-                self.pr_lanes.append([pr])
-
+        self.pr_lanes = assign_lanes(prs)
         self.pr_lanes.sort(key=lambda k: min([i["creationTimestamp"] for i in k]))
 
     def _compute_times(self):
@@ -412,39 +774,6 @@ class Something:
         Based on computed lanes, compute some statistical measures for the run.
         """
 
-        def add_time_interval(existing, new):
-            """
-            Merge the new interval with first overlaping existing interval or add new one to list.
-            """
-            start = "creationTimestamp"
-            end = "completionTime"
-            processed = False
-
-            for t in existing:
-                # If both ends are inside of existing interval, we ignore it
-                if t[start] <= new[start] <= t[end] and t[start] <= new[end] <= t[end]:
-                    processed = True
-                    continue
-
-                # If start is inside existing interval, but end is outside of it,
-                # we extend existing interval
-                if t[start] <= new[start] <= t[end]:
-                    if new[end] > t[end]:
-                        t[end] = new[end]
-                        processed = True
-                        continue
-
-                # If end is inside existing interval, but start is outside of it,
-                # we extend existing interval
-                if t[start] <= new[end] <= t[end]:
-                    if new[start] < t[start]:
-                        t[start] = new[start]
-                        processed = True
-                        continue
-
-            if not processed:
-                existing.append(new)
-
         start = "creationTimestamp"
         end = "completionTime"
 
@@ -457,26 +786,51 @@ class Something:
             ]
         )
 
-        for pr_name, pr_times in self.data.items():
-            pr_duration = pr_times[end] - pr_times[start]
-            self.pr_duration += pr_duration
-
-            # Combine TaskRuns so they do not overlap
-            trs = []
-            for tr_name, tr_times in pr_times["taskRuns"].items():
-                self.tr_duration += tr_times[end] - tr_times[start]
-                add_time_interval(trs, tr_times)
-
-            # Combine new intervals so they do not overlap
-            trs_no_overlap = []
-            for interval in trs:
-                add_time_interval(trs_no_overlap, interval)
-
-            tr_simple_duration = datetime.timedelta(0)
-            for interval in trs_no_overlap:
-                tr_simple_duration += interval[end] - interval[start]
-
-            self.pr_idle_duration += pr_duration - tr_simple_duration
+        # Columns of all PipelineRuns and TaskRuns, times as epoch seconds
+        pr_starts = []
+        pr_ends = []
+        tr_prs = []
+        tr_starts = []
+        tr_started = []
+        tr_ends = []
+        for pr_idx, pr_times in enumerate(self.data.values()):
+            pr_starts.append(pr_times[start].timestamp())
+            pr_ends.append(pr_times[end].timestamp())
+            for tr_times in pr_times["taskRuns"].values():
+                tr_prs.append(pr_idx)
+                tr_starts.append(tr_times[start].timestamp())
+                tr_started.append(tr_times["start_time"].timestamp())
+                tr_ends.append(tr_times[end].timestamp())
+
+        # TaskRuns of one PipelineRun are next to each other in the columns
+        critical_paths = []
+        first = 0
+        for pr_times in self.data.values():
+            last = first + len(pr_times["taskRuns"])
+            critical_paths.append(
+                longest_chain(list(zip(tr_starts[first:last], tr_ends[first:last])))
+            )
+            first = last
+
+        pr_starts = numpy.array(pr_starts)
+        pr_ends = numpy.array(pr_ends)
+        tr_starts = numpy.array(tr_starts)
+        tr_ends = numpy.array(tr_ends)
+        tr_queued = numpy.array(tr_started) - tr_starts
+
+        self.pr_duration = datetime.timedelta(seconds=(pr_ends - pr_starts).sum().item())
+        self.tr_duration = datetime.timedelta(seconds=(tr_ends - tr_starts).sum().item())
+
+        # Time when at least one TaskRun of the PipelineRun was running
+        busy = union_lengths(
+            numpy.array(tr_prs, dtype=numpy.int64),
+            tr_starts,
+            tr_ends,
+            self.pr_count,
+        )
+        self.pr_idle_duration = self.pr_duration - datetime.timedelta(
+            seconds=busy.sum().item()
+        )
 
         print()
         print(
@@ -506,13 +860,32 @@ class Something:
         print(
             f"In average PipelineRuns took {pr_duration_avg} and TaskRuns took {tr_duration_avg}, PipelineRuns were idle for {pr_idle_duration_avg} seconds"
         )
+        cp_avg, cp_p50, cp_p95, cp_max = describe(critical_paths)
+        print(
+            f"PipelineRuns critical path (longest chain of TaskRuns running one after another) avg/p50/p95/max: {cp_avg}/{cp_p50}/{cp_p95}/{cp_max} seconds"
+        )
+        queued_avg, queued_p50, queued_p95, queued_max = describe(tr_queued)
+        print(
+            f"TaskRuns queueing (from creation to start) avg/p50/p95/max: {queued_avg}/{queued_p50}/{queued_p95}/{queued_max} seconds"
+        )
 
-    def _compute_nodes(self):
+    def _get_node_columns(self):
         """
-        Based on loaded data, compute how many TaskRuns run on what nodes.
+        Return (and cache) columnar table of TaskRuns with known node:
+        names of tasks and nodes and per TaskRun arrays of PipelineRun,
+        task and node indexes and start and end epoch seconds.
         """
+        if self.node_columns is not None:
+            return self.node_columns
+
+        tasks = {}
         nodes = {}
-        for pr_name, pr_data in self.data.items():
+        prs = []
+        tr_tasks = []
+        tr_nodes = []
+        starts = []
+        ends = []
+        for pr_idx, (pr_name, pr_data) in enumerate(self.data.items()):
             for tr_name, tr_data in pr_data["taskRuns"].items():
                 try:
                     node_name = tr_data["node_name"]
@@ -521,58 +894,129 @@ class Something:
                         f"TaskRun {tr_name} missing node_name field, skipping."
                     )
                     continue
-                if node_name not in nodes:
-                    nodes[node_name] = 1
-                else:
-                    nodes[node_name] += 1
+                prs.append(pr_idx)
+                tr_tasks.append(tasks.setdefault(tr_name, len(tasks)))
+                tr_nodes.append(nodes.setdefault(node_name, len(nodes)))
+                starts.append(tr_data["start_time"].timestamp())
+                ends.append(tr_data["completionTime"].timestamp())
+
+        self.node_columns = {
+            "tasks": list(tasks),
+            "nodes": list(nodes),
+            "pr": numpy.array(prs, dtype=numpy.int64),
+            "task": numpy.array(tr_tasks, dtype=numpy.int64),
+            "node": numpy.array(tr_nodes, dtype=numpy.int64),
+            "start": numpy.array(starts),
+            "end": numpy.array(ends),
+        }
+        return self.node_columns
+
+    def _compute_nodes(self):
+        """
+        Based on loaded data, compute how many TaskRuns run on what nodes
+        and how many of them were running on every node in every second.
+        Load is also saved to nodes-load.csv in data directory, one row per
+        second when it changed.
+        """
+        columns = self._get_node_columns()
+        counts = numpy.bincount(columns["node"], minlength=len(columns["nodes"]))
 
         print("\nNumber of TaskRuns per node:")
-        for node, count in sorted(nodes.items(), key=lambda item: item[1]):
+        for node, count in sorted(zip(columns["nodes"], counts.tolist()), key=lambda item: item[1]):
             print(f"    {node}: {count}")
 
+        if columns["node"].size == 0:
+            return
+
+        # Concurrent TaskRuns per node only change when some TaskRun starts
+        # (+1) or the second after it ends (-1), so we only keep these change
+        # points, not every second of possibly days long data
+        origin = int(columns["start"].min())
+        first = columns["start"].astype(numpy.int64) - origin
+        last = columns["end"].astype(numpy.int64) - origin
+        node_of = numpy.concatenate([columns["node"], columns["node"]])
+        times = numpy.concatenate([first, last + 1])
+        deltas = numpy.concatenate([numpy.ones_like(first), -numpy.ones_like(last)])
+        order = numpy.lexsort((times, node_of))
+        node_of, times, deltas = node_of[order], times[order], deltas[order]
+        bounds = numpy.searchsorted(node_of, numpy.arange(len(columns["nodes"]) + 1))
+
+        table = []
+        changes = []  # per node: (change point seconds, load from that second on)
+        for node_idx, node in enumerate(columns["nodes"]):
+            node_times, idx = numpy.unique(
+                times[bounds[node_idx]:bounds[node_idx + 1]], return_inverse=True
+            )
+            node_load = numpy.cumsum(
+                numpy.bincount(idx, weights=deltas[bounds[node_idx]:bounds[node_idx + 1]])
+            ).astype(numpy.int64)
+            changes.append((node_times, node_load))
+            if node_times.size == 0:
+                table.append([node, counts[node_idx].item(), 0, 0, 0])
+                continue
+            # Load after the last change point is always 0
+            seconds = numpy.diff(node_times)
+            busy = seconds[node_load[:-1] > 0].sum().item()
+            table.append(
+                [
+                    node,
+                    counts[node_idx].item(),
+                    node_load.max().item(),
+                    (node_load[:-1] * seconds).sum().item() / busy if busy else 0,
+                    busy,
+                ]
+            )
+        table.sort(key=lambda row: row[2])
+        print("\nLoad of nodes (concurrent TaskRuns per second):")
+        print(
+            tabulate.tabulate(
+                table,
+                headers=["Node", "TaskRuns", "Max concurrent", "Avg concurrent when busy", "Busy seconds"],
+            )
+        )
+
+        # Every row is load of nodes from its timestamp until the next row
+        load_path = os.path.join(self.data_dir, "nodes-load.csv")
+        all_times = numpy.unique(times)
+        with open(load_path, "w") as fd:
+            writer = csv.writer(fd)
+            writer.writerow(["timestamp"] + columns["nodes"])
+            for chunk in range(0, all_times.size, 10000):
+                chunk_times = all_times[chunk:chunk + 10000]
+                load = numpy.zeros((len(columns["nodes"]), chunk_times.size), dtype=numpy.int64)
+                for node_idx, (node_times, node_load) in enumerate(changes):
+                    # Load at the last change point of the node not after the time
+                    pos = numpy.searchsorted(node_times, chunk_times, side="right") - 1
+                    valid = pos >= 0
+                    load[node_idx, valid] = node_load[pos[valid]]
+                for second, row in zip((chunk_times + origin).tolist(), load.T.tolist()):
+                    writer.writerow([second] + row)
+        print(f"Load of nodes (whenever it changes) saved to {load_path}")
+
     def _show_pr_tr_nodes(self):
         """
-        Show which PipelineRuns and TaskRuns were running on which node
+        Show which TaskRuns inside of one PipelineRun were running on the
+        same node. Every PipelineRun and node pair is a row in a 0/1 matrix
+        of tasks, so M.T @ M counts in how many PipelineRuns two tasks
+        shared a node. Also saved to nodes-colocation.csv in data directory.
         """
-        table = []
-        stats = {}
-        for pr_name, pr_data in self.data.items():
-            pr_tr_nodes = {}
-            for tr_name, tr_data in pr_data["taskRuns"].items():
-                try:
-                    node_name = tr_data["node_name"]
-                except KeyError:
-                    logging.info(
-                        f"TaskRun {tr_name} missing node_name field, skipping."
-                    )
-                    continue
-                table.append([pr_name, tr_name, node_name])
-                pr_tr_nodes[tr_name] = node_name
-
-            # Compile stats of whoch tasks ran on same node (in one PR) most often
-            for tr1 in pr_tr_nodes:
-                for tr2 in pr_tr_nodes:
-                    if pr_tr_nodes[tr1] == pr_tr_nodes[tr2]:
-                        if tr1 not in stats:
-                            stats[tr1] = {}
-                        if tr2 not in stats[tr1]:
-                            stats[tr1][tr2] = 0
-                        stats[tr1][tr2] += 1
+        columns = self._get_node_columns()
+        tasks = columns["tasks"]
+
+        pairs, rows = numpy.unique(
+            columns["pr"] * len(columns["nodes"]) + columns["node"],
+            return_inverse=True,
+        )
+        matrix = numpy.zeros((pairs.size, len(tasks)), dtype=numpy.int64)
+        matrix[rows, columns["task"]] = 1
+        shared = matrix.T @ matrix
 
         # Transform the stats to the form tabulate can handle
-        table_keys = sorted(list(stats.keys()))
-        table_data = []
-        for tr1 in table_keys:
-            table_row = []
-            for tr2 in table_keys:
-                table_row.append(stats[tr1][tr2])
-            table_data.append([tr1] + table_row)
-
-        # print("\nWhich PipelineRuns and TaskRuns ran on which node:")
-        # print(tabulate.tabulate(
-        #     table,
-        #     headers=["PipelineRun", "TaskRun", "Node"],
-        # ))
+        order = sorted(range(len(tasks)), key=lambda i: tasks[i])
+        table_keys = [tasks[i] for i in order]
+        table_data = [
+            [tasks[i]] + shared[i, order].tolist() for i in order
+        ]
 
         print(
             "\nWhich TaskRuns inside of one PipelineRun were sharing node most often:"
@@ -584,6 +1028,12 @@ class Something:
             )
         )
 
+        colocation_path = os.path.join(self.data_dir, "nodes-colocation.csv")
+        with open(colocation_path, "w") as fd:
+            writer = csv.writer(fd)
+            writer.writerow(["TaskRun"] + table_keys)
+            writer.writerows(table_data)
+
     def _show_pr_tr_conditions(self):
         print("\nPipelineRuns conditions frequency")
         print(
@@ -613,6 +1063,11 @@ class Something:
 
         Horizontal bar plot with gaps:
         https://matplotlib.org/stable/gallery/lines_bars_and_markers/broken_barh.html#sphx-glr-gallery-lines-bars-and-markers-broken-barh-py
+
+        Bars are drawn as one collection per color and names are only shown
+        for up to max_labels PipelineRuns and TaskRuns, as artist per bar
+        makes big graphs take ages. Unless format is given, graphs with more
+        than 1000 PipelineRuns are saved as PNG instead of SVG.
         """
 
         def entity_to_coords(entity):
@@ -631,7 +1086,16 @@ class Something:
             end = "completionTime"
             return max(entity[end].timestamp(), current_max)
 
-        size = max(5, self.pr_count / 2)
+        # Importing matplotlib takes a while, so only when plotting
+        import matplotlib.pyplot
+
+        pr_count = len(self.data)
+        fig_format = self.fig_format
+        if fig_format == "auto":
+            fig_format = "svg" if pr_count <= 1000 else "png"
+        fig_path = os.path.join(self.data_dir, f"output.{fig_format}")
+
+        size = max(5, pr_count / 2)
         size = min(size, 100)
         fig, ax = matplotlib.pyplot.subplots(figsize=(size, size))
 
@@ -640,12 +1104,6 @@ class Something:
 
         tr_height = 10
         fig_pr_y_pos = 0
-        colors = sorted(
-            matplotlib.colors.TABLEAU_COLORS,
-            key=lambda c: tuple(
-                matplotlib.colors.rgb_to_hsv(matplotlib.colors.to_rgb(c))
-            ),
-        )
         colors = [
             "tab:gray",
             "tab:brown",
@@ -659,27 +1117,28 @@ class Something:
             "tab:red",
         ]
 
+        pr_boxes = []
+        pr_labels = []
+        tr_boxes = [[] for _ in colors]
+        tr_labels = []
         for pr_lane in self.pr_lanes:
             for pr in pr_lane:
                 pr_coords = entity_to_coords(pr)
-                ax.broken_barh(
-                    [[pr_coords[0] - 1, pr_coords[1] + 2]],
-                    (fig_pr_y_pos + 1, tr_height * len(pr["tr_lanes"]) - 2),
-                    facecolors="white",
-                    edgecolor="black",
+                pr_boxes.append(
+                    (
+                        pr_coords[0] - 1,
+                        pr_coords[1] + 2,
+                        fig_pr_y_pos + 1,
+                        tr_height * len(pr["tr_lanes"]) - 2,
+                    )
                 )
-                txt = ax.text(
-                    x=pr_coords[0] + 4,
-                    y=fig_pr_y_pos + tr_height * len(pr["tr_lanes"]) - tr_height * 0.5,
-                    s=pr["name"],
-                    fontsize=8,
-                    horizontalalignment="left",
-                    verticalalignment="center",
-                    color="darkgray",
-                    rotation=-10,
-                    rotation_mode="anchor",
+                pr_labels.append(
+                    (
+                        pr_coords[0] + 4,
+                        fig_pr_y_pos + tr_height * len(pr["tr_lanes"]) - tr_height * 0.5,
+                        pr["name"],
+                    )
                 )
-                ax.add_artist(txt)
                 c_index = 0
                 fig_tr_y_pos = fig_pr_y_pos
                 for tr_lane in pr["tr_lanes"]:
@@ -687,50 +1146,94 @@ class Something:
                         fig_x_min = get_min(tr, fig_x_min)
                         fig_x_max = get_max(tr, fig_x_max)
                         tr_coords = entity_to_coords(tr)
-                        ax.broken_barh(
-                            [tr_coords],
-                            (fig_tr_y_pos + 2, tr_height - 4),
-                            facecolors=colors[c_index],
+                        tr_boxes[c_index].append(
+                            (tr_coords[0], tr_coords[1], fig_tr_y_pos + 2, tr_height - 4)
                         )
-                        txt = ax.text(
-                            x=tr_coords[0] + 2,
-                            y=fig_tr_y_pos + tr_height / 2,
-                            s=tr["name"],
-                            fontsize=8,
-                            horizontalalignment="left",
-                            verticalalignment="center",
-                            color="lightgray",
-                            rotation=30,
-                            rotation_mode="anchor",
+                        tr_labels.append(
+                            (tr_coords[0] + 2, fig_tr_y_pos + tr_height / 2, tr["name"])
                         )
-                        ax.add_artist(txt)
                         c_index += 1
                         if c_index == len(colors):
                             c_index = 0
                     fig_tr_y_pos += tr_height
             fig_pr_y_pos += tr_height * max([len(pr["tr_lanes"]) for pr in pr_lane])
+
+        ax.add_collection(
+            rectangles(pr_boxes, facecolors="white", edgecolor="black")
+        )
+        for color, boxes in zip(colors, tr_boxes):
+            ax.add_collection(rectangles(boxes, facecolors=color))
+
+        if len(pr_labels) <= self.max_labels:
+            for x, y, name in pr_labels:
+                ax.text(
+                    x=x,
+                    y=y,
+                    s=name,
+                    fontsize=8,
+                    horizontalalignment="left",
+                    verticalalignment="center",
+                    color="darkgray",
+                    rotation=-10,
+                    rotation_mode="anchor",
+                )
+        if len(tr_labels) <= self.max_labels:
+            for x, y, name in tr_labels:
+                ax.text(
+                    x=x,
+                    y=y,
+                    s=name,
+                    fontsize=8,
+                    horizontalalignment="left",
+                    verticalalignment="center",
+                    color="lightgray",
+                    rotation=30,
+                    rotation_mode="anchor",
+                )
+
         ax.set_ylim(0, fig_pr_y_pos)
         ax.set_xlim(fig_x_min - 10, fig_x_max + 10)
         ax.set_xlabel("timestamps [s]")
         ax.grid(True)
 
         # matplotlib.pyplot.show()
-        matplotlib.pyplot.savefig(self.fig_path, bbox_inches="tight")
-
-    def doit(self):
-        self._compute_lanes()
-        self._compute_times()
-        self._plot_graph()
-        self._show_pr_tr_conditions()
-        self._show_pr_tr_nodes()
-        self._compute_nodes()
+        matplotlib.pyplot.savefig(fig_path, bbox_inches="tight")
+        matplotlib.pyplot.close(fig)
+
+    def doit(self, stage="all"):
+        if stage in ("all", "times"):
+            self._compute_times()
+        if stage in ("all", "plot"):
+            self._compute_lanes()
+            self._plot_graph()
+        if stage in ("all", "conditions"):
+            self._show_pr_tr_conditions()
+        if stage in ("all", "nodes"):
+            self._show_pr_tr_nodes()
+            self._compute_nodes()
+
+
+# Stage => what it shows and kinds of items it needs
+STAGES = {
+    "all": ("Run all stages", tuple(FIELDS)),
+    "times": ("Show counts and durations, idle times, critical paths and queueing", ("PipelineRun", "TaskRun", "Pod")),
+    "plot": ("Plot graph of PipelineRuns and TaskRuns", ("PipelineRun", "TaskRun")),
+    "conditions": ("Show frequency of conditions and status messages", ("PipelineRun", "TaskRun")),
+    "nodes": ("Show node co-location of TaskRuns and load of nodes", ("PipelineRun", "TaskRun", "Pod")),
+}
 
 
 def doit(args):
+    stage = args.stage if args.stage is not None else "all"
     something = Something(
         data_dir=args.data_dir,
+        workers=args.workers,
+        fig_format=args.format,
+        max_labels=args.max_labels,
+        use_cache=not args.no_cache,
+        kinds=STAGES[stage][1],
     )
-    return something.doit()
+    return something.doit(stage)
 
 
 def main():
@@ -740,7 +1243,29 @@ def main():
     )
     parser.add_argument(
         "--data-dir",
-        help="Directory from where to load YAML data and where to put output SVG",
+        help="Directory from where to load YAML data and where to put output graph",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="How many processes to use for loading data files, number of CPUs by default",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["auto", "svg", "png", "webp"],
+        default="auto",
+        help="Format of the output graph, auto means SVG for up to 1000 PipelineRuns and PNG for more",
+    )
+    parser.add_argument(
+        "--max-labels",
+        type=int,
+        default=1000,
+        help="Do not show names in the graph when there is more PipelineRuns or TaskRuns than this",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Do not use nor create cache of loaded data (in {CACHE_DIR} directories next to data files)",
     )
     parser.add_argument(
         "-d",
@@ -748,6 +1273,12 @@ def main():
         action="store_true",
         help="Show debug output",
     )
+    subparsers = parser.add_subparsers(
+        dest="stage",
+        help="What to compute and show, all stages by default",
+    )
+    for stage, (help_text, _) in STAGES.items():
+        subparsers.add_parser(stage, help=help_text)
     args = parser.parse_args()
 
     fmt = "%(asctime)s %(name)s %(levelname)s %(message)s"
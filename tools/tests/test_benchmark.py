@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# Tests of tools/benchmark.py helpers that do not need a cluster. Run with
+# "python3 -m unittest discover tools/tests" (or pytest).
+
+import collections
+import importlib.util
+import json
+import os.path
+import sys
+import tempfile
+import threading
+import types
+import unittest
+import unittest.mock
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def load_tool(name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", name)
+    module_name = name.replace("-", "_")[:-3]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+benchmark = load_tool("benchmark.py")
+
+
+def stats_row(value):
+    """
+    Stats row with all counters 1 and all float columns set to value.
+    """
+    row = {}
+    for column in benchmark.STATS_COLUMNS:
+        column_type = benchmark.stats_column_type(column)
+        if column_type == "string":
+            row[column] = "benchmark1" if column == "namespace" else "2024-01-01T00:00:00+00:00"
+        elif column_type == "float":
+            row[column] = value
+        else:
+            row[column] = 1
+    return row
+
+
+class StatsWriterTest(unittest.TestCase):
+
+    @unittest.skipIf(pyarrow is None, "needs pyarrow")
+    def test_parquet_none_then_values(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.parquet")
+            writer = benchmark.StatsWriter(path, "parquet", benchmark.STATS_COLUMNS, 3600)
+            # Percentiles are None until first runs complete
+            writer.write(stats_row(None))
+            writer.flush()
+            writer.write(stats_row(1.5))
+            writer.flush()
+            writer.close()
+
+            table = pyarrow.parquet.read_table(path)
+            self.assertEqual(table.num_rows, 2)
+            self.assertEqual(table.column("prs_create_start_p50").to_pylist(), [None, 1.5])
+            self.assertEqual(table.schema.field("prs_total").type, pyarrow.int64())
+            self.assertEqual(table.schema.field("monitoring_now").type, pyarrow.string())
+
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.csv")
+            writer = benchmark.StatsWriter(path, "csv", benchmark.STATS_COLUMNS, 3600)
+            writer.write(stats_row(None))
+            writer.close()
+            with open(path, "r") as fd:
+                lines = fd.read().splitlines()
+            self.assertEqual(lines[0], ",".join(benchmark.STATS_COLUMNS))
+            self.assertEqual(len(lines), 2)
+
+
+class ArrivalScheduleTest(unittest.TestCase):
+
+    def fetch(self, text):
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml") as fd:
+            fd.write(text)
+            fd.flush()
+            return benchmark.fetch_arrival_schedule(fd.name)
+
+    def test_valid(self):
+        schedule = self.fetch(
+            "- {type: step, rates: [1, 2], duration: 10}\n"
+            "- {type: ramp, from: 0, to: 2, duration: 10}\n"
+            "- {type: poisson, rate: 1}\n"
+        )
+        self.assertEqual(len(schedule), 3)
+        self.assertEqual(benchmark.fetch_arrival_schedule("0.5"), [{"type": "constant", "rate": 0.5, "duration": None}])
+
+    def test_step_without_duration(self):
+        # Otherwise first rate would run forever and the rest never
+        with self.assertRaisesRegex(ValueError, "needs duration"):
+            self.fetch("- {type: step, rates: [1, 2, 4]}\n")
+
+    def test_invalid(self):
+        for text in (
+            "- {type: constant, duration: 10}\n",
+            "- {type: poisson, rate: 0, duration: 10}\n",
+            "- {type: step, rates: [], duration: 10}\n",
+            "- {type: ramp, to: 2, duration: 10}\n",
+            "- {type: constant, rate: 1}\n- {type: constant, rate: 2, duration: 10}\n",
+            "- {type: constant, rate: 1, duration: -1}\n",
+            "type: constant\n",
+        ):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.fetch(text)
+
+    def test_step_offsets(self):
+        schedule = self.fetch("- {type: step, rates: [1, 2], duration: 10}\n")
+        offsets = list(benchmark.arrival_offsets(schedule, None))
+        self.assertEqual(len([o for o in offsets if o < 10]), 9)
+        self.assertEqual(len([o for o in offsets if o >= 10]), 19)
+
+
+class ArrivalsResumeTest(unittest.TestCase):
+
+    def creator(self, state=None):
+        # Creator without API client, noting what it was asked to create
+        creator = benchmark.PipelineRunsCreator.__new__(benchmark.PipelineRunsCreator)
+        creator._lock = threading.Lock()
+        creator._records_lock = threading.Lock()
+        creator.creation_times = {}
+        creator.started_worked = creator.started_failed = 0
+        creator.latencies = []
+        creator.arrivals_created = collections.Counter()
+        creator.arrivals_elapsed = 0.0
+        creator._arrivals_start = None
+        creator.submitted = []
+        creator.submit = lambda body, namespace, requested_at: creator.submitted.append((namespace, requested_at))
+        resume = creator.arrivals_resume
+        creator.starts = []  # when the schedule would have started
+        creator.arrivals_resume = lambda: creator.starts.append(resume()) or creator.starts[-1]
+        if state is not None:
+            creator.from_state(json.loads(json.dumps(state)))
+        return creator
+
+    def arrivals(self, creator, total):
+        args = types.SimpleNamespace(arrival_schedule="50", total=total)
+        with unittest.mock.patch.object(benchmark, "load_run", return_value={}):
+            benchmark.arrivals_thread(args, ["a", "b"], creator, threading.Event())
+        return [
+            (namespace, round(requested_at - creator.starts[-1], 2))
+            for namespace, requested_at in creator.submitted
+        ]
+
+    def test_resume_continues_schedule(self):
+        first = self.creator()
+        self.arrivals(first, 3)
+        self.assertEqual(len(first.submitted), 6)
+        state = first.to_state()
+        self.assertEqual(state["arrivals"]["created"], {"a": 3, "b": 3})
+
+        second = self.creator(state)
+        offsets = self.arrivals(second, 5)
+        # Only the 4th and 5th arrival of every namespace, not from t=0 again
+        self.assertEqual(sorted(offsets), [("a", 0.08), ("a", 0.1), ("b", 0.08), ("b", 0.1)])
+        self.assertEqual(second.arrivals_created, {"a": 5, "b": 5})
+
+
+
+class CreationTimesTest(unittest.TestCase):
+
+    def test_unseen_runs_are_not_tracked(self):
+        records = {}
+        lock = threading.Lock()
+        creator = benchmark.PipelineRunsCreator.__new__(benchmark.PipelineRunsCreator)
+        creator.logger = benchmark.logging.getLogger("test")
+        creator._records = records
+        creator._records_lock = lock
+        creator.creation_times = {}
+        creator._lock = threading.Lock()
+        creator.in_flight = collections.Counter({"ns": 1})
+        creator.started_worked = creator.started_failed = 0
+        creator.latencies = []
+        creator._api_instance = unittest.mock.Mock()
+        creator._api_instance.create_namespaced_custom_object.return_value = {"metadata": {"name": "run-1"}}
+        creator._create({}, "ns", 100.0)
+
+        # Created, but the watch did not see it yet
+        self.assertEqual(records, {})
+        self.assertEqual(creator.creation_times["ns.run-1"][0], 100.0)
+
+        event = {
+            "type": "ADDED",
+            "object": {"metadata": {"namespace": "ns", "name": "run-1", "creationTimestamp": "2024-01-01T00:00:00Z"}},
+            "received_at": 101.0,
+        }
+        benchmark.process_event(event, records, benchmark.RunsStats(), "pipelineruns", None, creator.creation_times)
+        self.assertEqual(records["ns.run-1"].requested_at, 100.0)
+        self.assertTrue(hasattr(records["ns.run-1"], "state"))
+        self.assertEqual(creator.creation_times, {})
+
+
+if __name__ == "__main__":
+    unittest.main()